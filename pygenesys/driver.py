@@ -1,18 +1,33 @@
 #! /usr/bin/env python
 
-import numpy as np
-import importlib
-import inspect
+# Performance notes
+# -----------------
+# Building a database is bound by sqlite I/O and interpreter overhead,
+# not by arithmetic, so vectorizing or compiling the driver will not
+# help. The work that pays off is:
+#   * writing every table inside one transaction with relaxed pragmas
+#     (see ``db_creator.establish_connection``),
+#   * handing rows to sqlite in bulk (``executemany`` or multi-row
+#     ``INSERT`` statements) instead of looping in Python,
+#   * building SQL strings once rather than per row or per call,
+#   * caching imports and type checks (``load_infile``,
+#     ``_commodity_kind``).
+
+import functools
+import importlib.util
 import argparse
+import logging
 import os
 import sys
-import sqlite3
 
 # custom imports
-from pygenesys import model_info
 from pygenesys.technology.technology import Technology
-from pygenesys.commodity.commodity import *
-from pygenesys.make_config import *
+from pygenesys.commodity.commodity import (Commodity,
+                                           DemandCommodity,
+                                           EmissionsCommodity)
+from pygenesys.make_config import render_input
+
+log = logging.getLogger(__name__)
 
 
 def name_from_path(infile_path):
@@ -30,16 +45,31 @@ def name_from_path(infile_path):
     file_name_base : string
         The base name without the extension or path
     """
-    file_dir = os.path.dirname(infile_path)
-    sys.path.append(file_dir)
     file_name = os.path.basename(infile_path)
     file_name_base = os.path.splitext(file_name)[0]
     return file_name_base
 
 
+def register_infile_dir(infile_path):
+    """
+    Adds the directory of the input file to the front of ``sys.path``
+    so the input file can be imported. The directory is only added once.
+
+    Parameters
+    ----------
+    infile_path : string
+        The path to PyGenesys input file
+    """
+    file_dir = os.path.dirname(infile_path)
+    if file_dir not in sys.path:
+        sys.path.insert(0, file_dir)
+    return
+
+
 def load_infile(infile_path):
     """
     Loads the input file as a python package import based on the path.
+    Repeated calls with the same file return the already imported module.
 
     Parameters
     ----------
@@ -52,8 +82,32 @@ def load_infile(infile_path):
         The PyGenesys input file imported as a python
         module.
     """
+    return _import_infile(os.path.abspath(infile_path))
+
+
+@functools.lru_cache(maxsize=None)
+def _import_infile(infile_path):
+    """
+    Imports the input file at an absolute path. The module is loaded
+    straight from its file rather than searched for on ``sys.path``,
+    and is not reloaded if it has already been imported.
+    """
+    # the input file's directory is still registered so that the input
+    # file can import its own helper modules.
+    register_infile_dir(infile_path)
     file_name = name_from_path(infile_path)
-    infile = importlib.import_module(file_name)
+    infile = sys.modules.get(file_name)
+    if infile is None:
+        if not os.path.splitext(infile_path)[1]:
+            infile_path += '.py'
+        spec = importlib.util.spec_from_file_location(file_name, infile_path)
+        infile = importlib.util.module_from_spec(spec)
+        sys.modules[file_name] = infile
+        try:
+            spec.loader.exec_module(infile)
+        except Exception:
+            del sys.modules[file_name]
+            raise
     return infile
 
 
@@ -66,19 +120,44 @@ def collect_technologies(module_name):
     module_name : python module
         The PyGenesys input file once imported. Should be "infile."
     """
-    technologies = []
+    # iterate the module namespace directly; ``inspect.getmembers`` sorts
+    # every member and resolves each one through ``getattr``.
+    tech_type = Technology
+    technologies = [attrib for attrib in vars(module_name).values()
+                    if isinstance(attrib, tech_type)]
 
-    for member, attrib in inspect.getmembers(module_name):
-        try:
-            string_attr = str(attrib)
-        except BaseException:
-            string_attr = ''
+    return technologies
 
-        # if 'Technology' in string_attr:
-        if isinstance(attrib, Technology):
-            technologies.append(getattr(module_name, member))
 
-    return technologies
+# maps each commodity class to the kind of commodity it represents
+_COMMODITY_KINDS = {DemandCommodity: 'demand',
+                    EmissionsCommodity: 'emission',
+                    Commodity: 'resource'}
+
+# the kind of every type seen so far, including non-commodity types
+_KIND_CACHE = dict(_COMMODITY_KINDS)
+
+
+def _commodity_kind(comm):
+    """
+    Returns the kind of a commodity: 'demand', 'emission', or
+    'resource'. Returns None if ``comm`` is not a Commodity.
+    Each type is resolved against the commodity classes once, after
+    which its kind is a single dictionary lookup.
+    """
+    comm_type = type(comm)
+    try:
+        return _KIND_CACHE[comm_type]
+    except KeyError:
+        pass
+
+    kind = None
+    for base, base_kind in _COMMODITY_KINDS.items():
+        if issubclass(comm_type, base):
+            kind = base_kind
+            break
+    _KIND_CACHE[comm_type] = kind
+    return kind
 
 
 def _collect_commodities(technology_list):
@@ -90,13 +169,13 @@ def _collect_commodities(technology_list):
     for keys and Commodity objects for values. Therefore only unique
     commodities will be returned.
 
-    NOTE: This function fails to collect all commodities. Commodities must
-    be explicitly listed in the input file for now!
+    NOTE: The input file lists are still used to build the database.
+    Commodities must be explicitly listed in the input file for now!
 
 
     This function should be extended to account for cases where
-    the input and output commodities are lists (i.e. when there's
-    a ``techinputsplit``).
+    the output commodities are lists (i.e. when there's
+    a ``techoutputsplit``).
     """
 
     demand = {}
@@ -104,67 +183,43 @@ def _collect_commodities(technology_list):
     emission_dict = {}
 
     for tech in technology_list:
+        input_comms = tech.input_comm
+        output_comms = tech.output_comm
+        tech_emissions = tech.emissions
         for region in tech.regions:
-            print(f'REGION: {region}')
-            input_comm = tech.input_comm[region]
-            output_comm = tech.output_comm[region]
-
-            print(f'Commodity types for {tech.tech_name}')
-            print(f"{type(input_comm)}")
-            print(f"{type(output_comm)}")
-            # check the input commodity type
-            if isinstance(input_comm, Commodity):
-                # resource
-                if input_comm.comm_name not in resource:
-                    resource[input_comm.comm_name] = input_comm
-                    continue
-                else:
-                    continue
-            elif isinstance(input_comm, list):
+            input_comm = input_comms[region]
+            output_comm = output_comms[region]
+
+            log.debug("Commodity types for %s in %s: %s, %s",
+                      tech.tech_name, region,
+                      type(input_comm), type(output_comm))
+            # check the input commodity type, every input is a resource
+            if isinstance(input_comm, list):
                 for comm in input_comm:
-                    if (isinstance(comm, Commodity)) and \
-                       (comm.comm_name not in resource):
-                        resource[comm.comm_name] = comm
-                    else:
-                        continue
+                    if _commodity_kind(comm) is not None:
+                        resource.setdefault(comm.comm_name, comm)
+            elif _commodity_kind(input_comm) is not None:
+                resource.setdefault(input_comm.comm_name, input_comm)
             else:
                 print(f'Input commodity for {tech.tech_name} in {region} '
                       'is not a resource. Check input file.')
 
-            if isinstance(output_comm, DemandCommodity):
-                # demand
+            # check the output commodity type
+            output_kind = _commodity_kind(output_comm)
+            if output_kind == 'demand':
                 demand[output_comm.comm_name] = output_comm
-                # if output_comm.comm_name not in demand:
-                #     demand[output_comm.comm_name] = output_comm
-                #     continue
-                # else:
-                #     continue
-            elif isinstance(output_comm, Commodity):
-                # resource
-                if output_comm.comm_name not in resource:
-                    resource[output_comm.comm_name] = output_comm
-                    continue
-                else:
-                    continue
-
-            elif isinstance(output_comm, EmissionsCommodity):
-                # emission
+            elif output_kind == 'resource':
+                resource.setdefault(output_comm.comm_name, output_comm)
+            elif output_kind == 'emission':
                 print(f"Warning: Output commodity of {tech.tech_name}"
                       f"is an Emission Commodity. Check input file.")
-                continue
-            try:
-                emissions = tech.emissions[region]
-                print(f"{type(emissions)}")
-
-                # loop through emissions commodities
-                for emis in list(emissions.keys()):
-                    if (isinstance(emis, EmissionsCommodity)) and \
-                       (emis.comm_name not in emission_dict):
-                        emission_dict[emis.comm_name] = emis
-                    else:
-                        continue
-            except BaseException:
-                pass
+
+            emissions = tech_emissions.get(region, {})
+
+            # loop through emissions commodities
+            for emis in list(emissions.keys()):
+                if _commodity_kind(emis) == 'emission':
+                    emission_dict.setdefault(emis.comm_name, emis)
 
     resources = list(resource.values())
     demands = list(demand.values())
@@ -180,18 +235,22 @@ def _collect_commodities(technology_list):
 
 def main():
 
-    # Read commandline arguments
+    # Read commandline arguments before importing anything heavy, so
+    # ``--help`` and usage errors return immediately.
     ap = argparse.ArgumentParser(description='PyGenesys Parameters')
-    ap.add_argument('--infile', help='the name of the input file')
+    ap.add_argument('--infile', required=True,
+                    help='the name of the input file')
     args = ap.parse_args()
+
+    from pygenesys import model_info
+    from pygenesys.utils.db_creator import establish_connection
+
     print(f"Reading input from {args.infile} \n")
 
     infile = load_infile(args.infile)
     out_db = infile.database_filename
-    try:
-        out_path = infile.curr_dir + "/" + out_db
-    except BaseException:
-        out_path = "./" + out_db
+    curr_dir = getattr(infile, 'curr_dir', '.')
+    out_path = os.path.join(curr_dir, out_db)
 
     # get infile technologies
     technology_list = collect_technologies(infile)
@@ -216,7 +275,13 @@ def main():
     print(f"Database will be exported to {model.output_db} \n")
 
 
-    model._write_sqlite_database()
+    conn = establish_connection(model.output_db)
+    if conn is None:
+        raise RuntimeError(f"Could not open database {model.output_db}")
+    try:
+        model._write_sqlite_database(conn)
+    finally:
+        conn.close()
 
     print("Input file written successfully.\n")
 
@@ -232,10 +297,10 @@ def main():
             'scenario':infile.scenario_name}
 
     # outpath should be one folder up.
-    path = infile.curr_dir
+    path = curr_dir
     # split_path = infile.curr_dir.split('/')
     # path = "/".join(split_path[:-1])
-    print(f'{infile.curr_dir}\n')
+    print(f'{curr_dir}\n')
     print(f'{path}\n')
     rendered = render_input(input_path='default',
                             input_fname='default',
@@ -147,67 +147,80 @@ class ModelInfo(object):
 
         return np.unique(years)
 
-    def _write_sqlite_database(self):
+    def _write_sqlite_database(self, conn=None, fast_load=False):
         """
         Writes model info directly to an sqlite database.
+        All of the tables are written in a single transaction.
+
+        Parameters
+        ----------
+        conn : sqlite3 connection object, optional
+            An open connection to the output database. If no connection
+            is given, one is opened to ``output_db`` and closed afterwards.
+        fast_load : boolean, optional
+            If True, the largest tables are loaded before their primary
+            key index is built (see ``create_schema``). Default is False.
         """
 
-        conn = establish_connection(self.output_db)
+        close_conn = conn is None
+        if close_conn:
+            conn = establish_connection(self.output_db)
         conn.execute("PRAGMA foreign_keys = 1")
-        # create fundamental tables
-        seasons = create_time_season(conn, self.N_seasons)
-        create_time_period_labels(conn)
-        create_time_periods(conn, self.time_horizon, self.existing_years)
-        # create_existing_periods(conn, self.technology_list)
-        time_slices = create_time_of_day(conn, self.N_hours)
-        create_segfrac(conn, self.seg_frac, seasons, time_slices)
-        create_regions(conn, self.regions)
-        create_commodity_labels(conn)
-        create_commodities(conn, self.commodities)
-        create_emissions_limit(conn, self.commodities['emissions'])
-        create_global_discount(conn, self.global_discount)
-        create_reserve_margin(conn, self.reserve_margin)
-        create_demand_table(conn,
-                            self.commodities['demand'],
-                            self.time_horizon)
-        create_demand_specific_distribution(conn,
-                                            self.commodities['demand'],
+        # one cursor is shared by all of the table writers
+        cursor = conn.cursor()
+        try:
+            with transaction(conn):
+                create_schema(cursor, fast_load=fast_load)
+                # create fundamental tables
+                seasons = create_time_season(cursor, self.N_seasons)
+                create_time_period_labels(cursor)
+                create_time_periods(cursor, self.time_horizon, self.existing_years)
+                # create_existing_periods(conn, self.technology_list)
+                time_slices = create_time_of_day(cursor, self.N_hours)
+                create_segfrac(cursor, self.seg_frac)
+                create_regions(cursor, self.regions)
+                create_commodity_labels(cursor)
+                create_commodities(cursor, self.commodities)
+                create_emissions_limit(cursor, self.commodities['emissions'])
+                create_global_discount(cursor, self.global_discount)
+                create_reserve_margin(cursor, self.reserve_margin)
+                create_demand_table(cursor,
+                                    self.commodities['demand'],
+                                    self.time_horizon)
+                create_demand_specific_distribution(cursor,
+                                                    self.commodities['demand'],
+                                                    time_slices,
+                                                    seasons)
+                create_technology_labels(cursor)
+                create_sectors(cursor, self.tech_sectors)
+                create_technologies(cursor, self.technologies)
+                create_capacity_to_activity(cursor, self.technologies)
+                create_lifetime_tech(cursor, self.technologies)
+                create_loan_lifetime(cursor, self.technologies)
+                create_tech_reserve(cursor, self.technologies)
+                create_tech_ramping(cursor, self.technologies)
+                create_tech_storage(cursor, self.technologies)
+                create_tech_curtailment(cursor, self.technologies)
+                create_tech_exchange(cursor, self.technologies)
+                create_max_capacity(cursor, self.technologies)
+                create_min_capacity(cursor, self.technologies)
+                create_existing_capacity(cursor, self.technologies, self.time_horizon)
+                create_efficiency(cursor, self.technologies, self.time_horizon)
+                create_emissions_activity(cursor, self.technologies, self.time_horizon)
+                create_invest_cost(cursor, self.technologies, self.time_horizon)
+                create_variable_cost(cursor, self.technologies, self.time_horizon)
+                create_fixed_cost(cursor, self.technologies, self.time_horizon)
+                create_capacity_factor_tech(cursor,
+                                            self.technologies,
                                             time_slices,
                                             seasons)
-        create_technology_labels(conn)
-        create_sectors(conn, self.tech_sectors)
-        create_technologies(conn, self.technologies)
-        create_capacity_to_activity(conn, self.technologies)
-        create_lifetime_tech(conn, self.technologies)
-        create_loan_lifetime(conn, self.technologies)
-        create_tech_reserve(conn, self.technologies)
-        create_tech_ramping(conn, self.technologies)
-        create_tech_storage(conn, self.technologies)
-        create_tech_curtailment(conn, self.technologies)
-        create_tech_exchange(conn, self.technologies)
-        create_max_capacity(conn, self.technologies)
-        create_min_capacity(conn, self.technologies)
-        create_existing_capacity(conn, self.technologies, self.time_horizon)
-        create_efficiency(conn, self.technologies, self.time_horizon)
-        create_emissions_activity(conn, self.technologies, self.time_horizon)
-        create_invest_cost(conn, self.technologies, self.time_horizon)
-        create_variable_cost(conn, self.technologies, self.time_horizon)
-        create_fixed_cost(conn, self.technologies, self.time_horizon)
-        create_capacity_factor_tech(conn,
-                                    self.technologies,
-                                    time_slices,
-                                    seasons)
-        create_MyopicBaseYear(conn)
-
-        # output tables
-        create_output_vcapacity(conn)
-        create_output_vflow_out(conn)
-        create_output_vflow_in(conn)
-        create_output_objective(conn)
-        create_output_curtailment(conn)
-        create_output_emissions(conn)
-        create_output_costs(conn)
-        create_output_duals(conn)
-        create_output_capacitybyperiodtech(conn)
-        conn.close()
+                if fast_load:
+                    create_bulk_indexes(cursor)
+            if not close_conn:
+                # let other processes open the database while the
+                # caller still holds the connection
+                release_lock(conn)
+        finally:
+            if close_conn:
+                conn.close()
         return
@@ -1,4 +1,8 @@
 from pygenesys.utils.db_creator import *
+from pygenesys.utils.db_creator import (_insert_rows, _operating_vintages,
+                                        _tech_vintages)
+from pygenesys.commodity.commodity import DemandCommodity
+from pygenesys.technology.technology import Technology
 import os
 import numpy as np
 
@@ -9,7 +13,7 @@ N_hours = 24
 start_year = 2020
 end_year = 2050
 N_years = 6
-seasons = [[f'S{i+1}'] for i in range(N_seasons)]
+seasons = [f'S{i+1}' for i in range(N_seasons)]
 periods = np.linspace(start_year, end_year, N_years)
 existing_years = np.array([1990, 1995])
 
@@ -25,10 +29,139 @@ def test_establish_connection():
     return
 
 
+def test_establish_connection_not_sqlite():
+    with open(test_db, 'w') as f:
+        f.write('not a database' * 100)
+    try:
+        establish_connection(test_db)
+        rejected = False
+    except sqlite3.DatabaseError:
+        rejected = True
+
+    assert(rejected)
+
+    os.remove(test_db)
+    return
+
+
+def test_configure_connection():
+    conn = establish_connection(test_db)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    fast_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+    configure_connection(conn, durable=True)
+    durable_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+    conn.close()
+
+    # synchronous: 1 is NORMAL, 2 is FULL
+    assert(journal_mode == 'wal')
+    assert(page_size == 8192)
+    assert(fast_sync == 1)
+    assert(durable_sync == 2)
+
+    os.remove(test_db)
+    return
+
+
+def test_release_lock():
+    conn = establish_connection(test_db)
+    create_schema(conn)
+    release_lock(conn)
+
+    # a second connection can read once the lock is released
+    reader = sqlite3.connect(test_db, timeout=0)
+    tables = list(reader.execute("SELECT name FROM sqlite_master "
+                                 "WHERE type = 'table'"))
+    reader.close()
+    conn.close()
+
+    assert(len(tables) == len(TABLE_DDL))
+
+    os.remove(test_db)
+    return
+
+
+def test_transaction_rollback():
+    conn = establish_connection(test_db)
+    create_schema(conn)
+    try:
+        with transaction(conn):
+            create_time_season(conn, N_seasons)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    table_data = list(conn.execute("SELECT * FROM time_season"))
+    conn.close()
+
+    assert(len(table_data) == 0)
+
+    os.remove(test_db)
+    return
+
+
+def test_transaction_keeps_error():
+    conn = establish_connection(test_db)
+    try:
+        with transaction(conn):
+            # the transaction ends before the block raises
+            conn.execute("ROLLBACK")
+            raise RuntimeError
+    except RuntimeError:
+        kept = True
+    except sqlite3.OperationalError:
+        kept = False
+    conn.close()
+
+    assert(kept)
+
+    os.remove(test_db)
+    return
+
+
+def test_transaction_rollback_schema():
+    conn = establish_connection(test_db)
+    try:
+        with transaction(conn):
+            create_schema(conn)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    tables = list(conn.execute("SELECT name FROM sqlite_master"))
+    conn.close()
+
+    assert(len(tables) == 0)
+
+    os.remove(test_db)
+    return
+
+
+def test_create_bulk_indexes():
+    conn = establish_connection(test_db)
+    create_schema(conn, fast_load=True)
+    pk = [col[5] for col in
+          conn.execute('PRAGMA table_info("CapacityFactorTech")')]
+    row = ('IL', 'S1', 'H1', 'PLANT', 0.5, '')
+    _insert_rows(conn, 'CapacityFactorTech', [row], 6)
+    create_bulk_indexes(conn)
+    try:
+        _insert_rows(conn, 'CapacityFactorTech', [row], 6)
+        rejected = False
+    except sqlite3.IntegrityError:
+        rejected = True
+    conn.close()
+
+    assert(not any(pk))
+    assert(rejected)
+
+    os.remove(test_db)
+    return
+
+
 def test_create_time_season():
 
     # set up
     conn = establish_connection(test_db)
+    create_schema(conn)
     func_seasons = create_time_season(conn, N_seasons)
     cursor = conn.cursor()
     table_data = list(cursor.execute("SELECT * FROM time_season"))
@@ -46,6 +179,7 @@ def test_create_time_season():
 def test_create_time_period_labels():
     # set up
     conn = establish_connection(test_db)
+    create_schema(conn)
     create_time_period_labels(conn)
     cursor = conn.cursor()
     table_data = list(cursor.execute("SELECT * FROM time_period_labels"))
@@ -62,6 +196,7 @@ def test_create_time_period_labels():
 def test_create_time_periods():
     # set up
     conn = establish_connection(test_db)
+    create_schema(conn)
     create_time_periods(conn, periods, existing_years)
     cursor = conn.cursor()
     table_data = list(cursor.execute("SELECT * FROM time_periods"))
@@ -72,3 +207,113 @@ def test_create_time_periods():
 
     os.remove(test_db)
     return
+
+
+def test_create_segfrac():
+    # set up
+    conn = establish_connection(test_db)
+    create_schema(conn)
+    create_time_season(conn, N_seasons)
+    create_time_of_day(conn, N_hours)
+    create_segfrac(conn, 1 / (N_seasons * N_hours))
+    cursor = conn.cursor()
+    table_data = list(cursor.execute("SELECT * FROM SegFrac"))
+    conn.close()
+
+    # tests
+    assert(len(table_data) == N_seasons * N_hours)
+    assert(table_data[0][:2] == ('S1', 'H1'))
+    assert(table_data[-1][:2] == (f'S{N_seasons}', f'H{N_hours}'))
+
+    os.remove(test_db)
+    return
+
+
+def test_create_demand_specific_distribution():
+    # set up
+    conn = establish_connection(test_db)
+    create_schema(conn)
+    func_seasons = create_time_season(conn, N_seasons)
+    func_hours = create_time_of_day(conn, N_hours)
+    regions = ['IL', 'WI', 'MN']
+    demand = DemandCommodity(comm_name='ELC_DEMAND', units='GWh')
+    for region in regions:
+        demand.distribution[region] = np.ones(N_seasons * N_hours) / \
+            (N_seasons * N_hours)
+    create_demand_specific_distribution(conn,
+                                        [demand],
+                                        func_hours,
+                                        func_seasons)
+    cursor = conn.cursor()
+    table_data = list(cursor.execute(
+        "SELECT * FROM DemandSpecificDistribution"))
+    conn.close()
+
+    # tests
+    assert(len(table_data) == len(regions) * N_seasons * N_hours)
+
+    os.remove(test_db)
+    return
+
+
+def test_insert_rows():
+    # set up
+    conn = establish_connection(test_db)
+    conn.execute('CREATE TABLE "chunks" ("idx" integer, "label" text)')
+    rows = [(i, f'row{i}') for i in range(1000)]
+    _insert_rows(conn, "chunks", rows, 2)
+    cursor = conn.cursor()
+    table_data = list(cursor.execute("SELECT * FROM chunks ORDER BY idx"))
+    conn.close()
+
+    # tests
+    assert(table_data == rows)
+
+    os.remove(test_db)
+    return
+
+
+def test_operating_vintages():
+    vintages = np.sort(np.concatenate([existing_years, periods]))
+    lifetime = 30.0
+
+    for year in periods:
+        expected = [v for v in vintages if 0 <= (year - v) < lifetime]
+        operating = _operating_vintages(vintages, year, lifetime)
+        assert(list(operating) == expected)
+
+    return
+
+
+def test_tech_vintages():
+    plant = Technology(tech_name='PLANT', units='MW', capacity_to_activity=1)
+    plant.tech_lifetime = {'IL': 40, 'WI': 40}
+    plant.existing_capacity = {'IL': {1970: 1.0, 1990: 2.0, 1995: 1.5}}
+
+    il_vintages = _tech_vintages(plant, 'IL', periods)
+    wi_vintages = _tech_vintages(plant, 'WI', periods)
+
+    assert(il_vintages.tolist() == [1990, 1995] + periods.astype(int).tolist())
+    assert(wi_vintages.tolist() == periods.astype(int).tolist())
+
+    return
+
+
+def test_emit_ddl():
+    spec = {"cols": [("tech", "text"), ("value", "real")],
+            "pk": ["tech"],
+            "fks": []}
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute(emit_ddl("Keyed", spec))
+
+    conn.execute('INSERT INTO "Keyed" VALUES (?, ?)', ('PLANT', 1.0))
+    try:
+        conn.execute('INSERT INTO "Keyed" VALUES (?, ?)', ('PLANT', 2.0))
+        rejected = False
+    except sqlite3.IntegrityError:
+        rejected = True
+    assert(rejected)
+
+    conn.close()
+    return
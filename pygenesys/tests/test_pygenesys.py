@@ -1,5 +1,11 @@
+import os
+import sys
 from pygenesys import technology
 from pygenesys import driver
+from pygenesys.technology.technology import Technology
+from pygenesys.commodity.commodity import (Commodity,
+                                           DemandCommodity,
+                                           EmissionsCommodity)
 
 
 def test_name_from_path():
@@ -19,3 +25,55 @@ def test_name_from_path_has_p():
     assert(driver.name_from_path("~/testp") == "testp")
 
     return
+
+
+def test_register_infile_dir():
+    infile_dir = os.path.abspath('/Users/test')
+    driver.register_infile_dir(infile_dir + '/test.py')
+    driver.register_infile_dir(infile_dir + '/other.py')
+
+    assert(sys.path[0] == infile_dir)
+    assert(sys.path.count(infile_dir) == 1)
+
+    sys.path.remove(infile_dir)
+    return
+
+
+def test_load_infile_cached(tmp_path, monkeypatch):
+    # the input file's directory is added to sys.path; restore it after
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+    infile_path = str(tmp_path / 'cached_infile.py')
+    with open(infile_path, 'w') as infile:
+        infile.write("scenario_name = 'test'\n")
+
+    try:
+        first = driver.load_infile(infile_path)
+        second = driver.load_infile(infile_path)
+    finally:
+        sys.modules.pop('cached_infile', None)
+        driver._import_infile.cache_clear()
+
+    assert(first is second)
+    assert(first.scenario_name == 'test')
+
+    return
+
+
+def test_collect_commodities():
+    gas = Commodity(comm_name='gas', units='MWh')
+    elc = DemandCommodity(comm_name='ELC', units='MWh')
+    co2 = EmissionsCommodity(comm_name='CO2', units='kT')
+
+    plant = Technology(tech_name='PLANT', units='MW', capacity_to_activity=1)
+    plant.add_regional_data(region='IL',
+                            input_comm=gas,
+                            output_comm=elc,
+                            emissions={co2: 0.5})
+
+    resources, demands, emissions = driver._collect_commodities([plant])
+
+    assert(resources == [gas])
+    assert(demands == [elc])
+    assert(emissions == [co2])
+
+    return
@@ -1,13 +1,503 @@
 
+import contextlib
 import itertools
 import sqlite3
 import numpy as np
 from pygenesys.commodity.commodity import *
 
-comm_types = np.array([EmissionsCommodity, Commodity, DemandCommodity])
+TABLE_DDL = {
+    "time_season": """CREATE TABLE "time_season" (
+    	"t_season"	text,
+    	PRIMARY KEY("t_season")
+    );""",
+    "time_periods": """CREATE TABLE "time_periods" (
+    	"t_periods"	integer,
+    	"flag"	text,
+    	PRIMARY KEY("t_periods"),
+    	FOREIGN KEY("flag") REFERENCES "time_period_labels"("t_period_labels")
+    );""",
+    "time_period_labels": """CREATE TABLE "time_period_labels" (
+    	"t_period_labels"	text,
+    	"t_period_labels_desc"	text,
+    	PRIMARY KEY("t_period_labels")
+    );""",
+    "time_of_day": """CREATE TABLE "time_of_day" (
+    	"t_day"	text,
+    	PRIMARY KEY("t_day")
+    );""",
+    "SegFrac": """CREATE TABLE "SegFrac" (
+    	"season_name"	text,
+    	"time_of_day_name"	text,
+    	"segfrac"	real CHECK("segfrac" >= 0 AND "segfrac" <= 1),
+    	"segfrac_notes"	text,
+    	PRIMARY KEY("season_name","time_of_day_name"),
+    	FOREIGN KEY("season_name") REFERENCES "time_season"("t_season"),
+    	FOREIGN KEY("time_of_day_name") REFERENCES "time_of_day"("t_day")
+    );""",
+    "commodity_labels": """CREATE TABLE "commodity_labels" (
+    "comm_labels"	text,
+    "comm_labels_desc"	text,
+    	PRIMARY KEY("comm_labels")
+    );""",
+    "commodities": """CREATE TABLE "commodities" (
+    	"comm_name"	text,
+    	"flag"	text,
+    	"comm_desc"	text,
+    	PRIMARY KEY("comm_name"),
+    	FOREIGN KEY("flag") REFERENCES "commodity_labels"("comm_labels")
+    );""",
+    "regions": """CREATE TABLE "regions" (
+    	"regions"	TEXT,
+    	"region_note"	TEXT,
+    	PRIMARY KEY("regions")
+    );""",
+    "Demand": """CREATE TABLE "Demand" (
+    	"regions"	text,
+    	"periods"	integer,
+    	"demand_comm"	text,
+    	"demand"	real,
+    	"demand_units"	text,
+    	"demand_notes"	text,
+    	PRIMARY KEY("regions","periods","demand_comm"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("demand_comm") REFERENCES "commodities"("comm_name")
+    );""",
+    "DemandSpecificDistribution": """CREATE TABLE "DemandSpecificDistribution" (
+    	"regions"	text,
+    	"season_name"	text,
+    	"time_of_day_name"	text,
+    	"demand_name"	text,
+    	"dds"	real CHECK("dds" >= 0 AND "dds" <= 1),
+    	"dds_notes"	text,
+    	PRIMARY KEY("regions","season_name","time_of_day_name","demand_name"),
+    	FOREIGN KEY("season_name") REFERENCES "time_season"("t_season"),
+    	FOREIGN KEY("time_of_day_name") REFERENCES "time_of_day"("t_day"),
+    	FOREIGN KEY("demand_name") REFERENCES "commodities"("comm_name")
+    );""",
+    "technology_labels": """CREATE TABLE "technology_labels" (
+    	"tech_labels"	text,
+    	"tech_labels_desc"	text,
+    	PRIMARY KEY("tech_labels")
+    );""",
+    "sector_labels": """CREATE TABLE "sector_labels" (
+    "sector"	text,
+    	PRIMARY KEY("sector")
+    );""",
+    "technologies": """CREATE TABLE "technologies" (
+    "tech"	text,
+    "flag"	text,
+    "sector"	text,
+    "tech_desc"	text,
+    "tech_category"	text,
+    	PRIMARY KEY("tech"),
+    	FOREIGN KEY("flag") REFERENCES "technology_labels"("tech_labels"),
+    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector")
+    );""",
+    "Efficiency": """CREATE TABLE "Efficiency" (
+    	"regions"	text,
+    	"input_comm"	text,
+    	"tech"	text,
+    	"vintage"	integer,
+    	"output_comm"	text,
+    	"efficiency"	real CHECK("efficiency" > 0),
+    	"eff_notes"	text,
+    	PRIMARY KEY("regions","input_comm","tech","vintage","output_comm"),
+    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name")
+    );""",
+    "ExistingCapacity": """CREATE TABLE "ExistingCapacity" (
+    	"regions"	text,
+    	"tech"	text,
+    	"vintage"	integer,
+    	"exist_cap"	real,
+    	"exist_cap_units"	text,
+    	"exist_cap_notes"	text,
+    	PRIMARY KEY("regions","tech","vintage"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods")
+    );""",
+    "LifetimeTech": """CREATE TABLE "LifetimeTech" (
+    	"regions"	text,
+    	"tech"	text,
+    	"life"	real,
+    	"life_notes"	text,
+    	PRIMARY KEY("regions","tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "CostVariable": """CREATE TABLE "CostVariable" (
+    	"regions"	text NOT NULL,
+    	"periods"	integer NOT NULL,
+    	"tech"	text NOT NULL,
+    	"vintage"	integer NOT NULL,
+    	"cost_variable"	real,
+    	"cost_variable_units"	text,
+    	"cost_variable_notes"	text,
+    	PRIMARY KEY("regions","periods","tech","vintage"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
+    );""",
+    "CostInvest": """CREATE TABLE "CostInvest" (
+    	"regions"	text,
+    	"tech"	text,
+    	"vintage"	integer,
+    	"cost_invest"	real,
+    	"cost_invest_units"	text,
+    	"cost_invest_notes"	text,
+    	PRIMARY KEY("regions","tech","vintage"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods")
+    );""",
+    "CostFixed": """CREATE TABLE "CostFixed" (
+    	"regions"	text NOT NULL,
+    	"periods"	integer NOT NULL,
+    	"tech"	text NOT NULL,
+    	"vintage"	integer NOT NULL,
+    	"cost_fixed"	real,
+    	"cost_fixed_units"	text,
+    	"cost_fixed_notes"	text,
+    	PRIMARY KEY("regions","periods","tech","vintage"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
+    );""",
+    "PlanningReserveMargin": """CREATE TABLE "PlanningReserveMargin" (
+    	`regions`	text,
+    	`reserve_margin`	REAL,
+    	PRIMARY KEY(regions),
+    	FOREIGN KEY(`regions`) REFERENCES regions
+    );""",
+    "tech_reserve": """CREATE TABLE "tech_reserve" (
+    	"tech"	text,
+    	"notes"	text,
+    	PRIMARY KEY("tech")
+    );""",
+    "GlobalDiscountRate": """CREATE TABLE "GlobalDiscountRate" (
+    	"rate"	real
+    );""",
+    "tech_ramping": """CREATE TABLE "tech_ramping" (
+    	"tech"	text,
+    	"notes"	text,
+    	PRIMARY KEY("tech")
+    );""",
+    "RampUp": """CREATE TABLE RampUp(
+    	"regions" text,
+    	"tech" text,
+    	"ramp_up" real,
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	PRIMARY KEY ("regions", "tech")
+    );""",
+    "RampDown": """CREATE TABLE RampDown(
+    	"regions" text,
+    	"tech" text,
+    	"ramp_down" real,
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	PRIMARY KEY ("regions", "tech")
+    );""",
+    "StorageDuration": """CREATE TABLE "StorageDuration" (
+    	"regions"	text,
+    	"tech"	text,
+    	"duration"	real,
+    	"duration_notes"	text,
+    	PRIMARY KEY("regions","tech")
+    );""",
+    "LifetimeLoanTech": """CREATE TABLE "LifetimeLoanTech" (
+    	"regions"	text,
+    	"tech"	text,
+    	"loan"	real,
+    	"loan_notes"	text,
+    	PRIMARY KEY("regions","tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "CapacityToActivity": """CREATE TABLE "CapacityToActivity" (
+    	"regions"	text,
+    	"tech"	text,
+    	"c2a"	real,
+    	"c2a_notes"	TEXT,
+    	PRIMARY KEY("regions","tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "EmissionLimit": """CREATE TABLE "EmissionLimit" (
+    	"regions"	text,
+    	"periods"	integer,
+    	"emis_comm"	text,
+    	"emis_limit"	real,
+    	"emis_limit_units"	text,
+    	"emis_limit_notes"	text,
+    	PRIMARY KEY("periods","emis_comm"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("emis_comm") REFERENCES "commodities"("comm_name")
+    );""",
+    "EmissionActivity": """CREATE TABLE "EmissionActivity" (
+    	"regions"	text,
+    	"emis_comm"	text,
+    	"input_comm"	text,
+    	"tech"	text,
+    	"vintage"	integer,
+    	"output_comm"	text,
+    	"emis_act"	real,
+    	"emis_act_units"	text,
+    	"emis_act_notes"	text,
+    	PRIMARY KEY("regions","emis_comm","input_comm","tech","vintage","output_comm"),
+    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
+    	FOREIGN KEY("emis_comm") REFERENCES "commodities"("comm_name")
+    );""",
+    "tech_curtailment": """CREATE TABLE "tech_curtailment" (
+    	"tech"	text,
+    	"notes"	TEXT,
+    	PRIMARY KEY("tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "MaxCapacity": """CREATE TABLE "MaxCapacity" (
+    	"regions"	text,
+    	"periods"	integer,
+    	"tech"	text,
+    	"maxcap"	real,
+    	"maxcap_units"	text,
+    	"maxcap_notes"	text,
+    	PRIMARY KEY("regions","periods","tech"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "MinCapacity": """CREATE TABLE "MinCapacity" (
+    	"regions"	text,
+    	"periods"	integer,
+    	"tech"	text,
+    	"maxcap"	real,
+    	"maxcap_units"	text,
+    	"maxcap_notes"	text,
+    	PRIMARY KEY("regions","periods","tech"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "tech_exchange": """CREATE TABLE "tech_exchange" (
+    	"tech"	text,
+    	"notes"	TEXT,
+    	PRIMARY KEY("tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
+    );""",
+    "TechInputSplit": """CREATE TABLE "TechInputSplit" (
+    	"regions"	TEXT,
+    	"periods"	integer,
+    	"input_comm"	text,
+    	"tech"	text,
+    	"ti_split"	real,
+    	"ti_split_notes"	text,
+    	PRIMARY KEY("regions","periods","input_comm","tech"),
+    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
+    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
+    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
+    );""",
+    "MyopicBaseyear": """CREATE TABLE "MyopicBaseyear" (
+    	"year"	real
+    	"notes"	text
+    );""",
+}
+
+# Tables described as data and compiled to DDL by ``emit_ddl``: the
+# Output_* tables, which are only ever created empty for Temoa to fill in,
+# and the tables in ``BULK_TABLES``, whose primary key may be left out.
+SCHEMAS = {
+    "CapacityFactorTech": {
+        "cols": [("regions", "text"),
+                 ("season_name", "text"),
+                 ("time_of_day_name", "text"),
+                 ("tech", "text"),
+                 ("cf_tech", 'real CHECK("cf_tech" >= 0 AND "cf_tech" <= 1)'),
+                 ("cf_tech_notes", "text")],
+        "pk": ["regions", "season_name", "time_of_day_name", "tech"],
+        "fks": [("season_name", "time_season", "t_season"),
+                ("time_of_day_name", "time_of_day", "t_day"),
+                ("tech", "technologies", "tech")],
+    },
+    "Output_V_Capacity": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("capacity", "real")],
+        "pk": ["regions", "scenario", "tech", "vintage"],
+        "fks": [("sector", "sector_labels", "sector"),
+                ("tech", "technologies", "tech"),
+                ("vintage", "time_periods", "t_periods")],
+    },
+    "Output_VFlow_Out": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("t_periods", "integer"),
+                 ("t_season", "text"),
+                 ("t_day", "text"),
+                 ("input_comm", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("output_comm", "text"),
+                 ("vflow_out", "real")],
+        "pk": ["regions", "scenario", "t_periods", "t_season", "t_day",
+               "input_comm", "tech", "vintage", "output_comm"],
+        "fks": [("output_comm", "commodities", "comm_name"),
+                ("t_periods", "time_periods", "t_periods"),
+                ("vintage", "time_periods", "t_periods"),
+                ("t_season", "time_periods", "t_periods"),
+                ("tech", "technologies", "tech"),
+                ("sector", "sector_labels", "sector"),
+                ("t_day", "time_of_day", "t_day"),
+                ("input_comm", "commodities", "comm_name")],
+    },
+    "Output_VFlow_In": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("t_periods", "integer"),
+                 ("t_season", "text"),
+                 ("t_day", "text"),
+                 ("input_comm", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("output_comm", "text"),
+                 ("vflow_in", "real")],
+        "pk": ["regions", "scenario", "t_periods", "t_season", "t_day",
+               "input_comm", "tech", "vintage", "output_comm"],
+        "fks": [("vintage", "time_periods", "t_periods"),
+                ("output_comm", "commodities", "comm_name"),
+                ("t_periods", "time_periods", "t_periods"),
+                ("sector", "sector_labels", "sector"),
+                ("t_season", "time_periods", "t_periods"),
+                ("t_day", "time_of_day", "t_day"),
+                ("input_comm", "commodities", "comm_name"),
+                ("tech", "technologies", "tech")],
+    },
+    "Output_Objective": {
+        "cols": [("scenario", "text"),
+                 ("objective_name", "text"),
+                 ("total_system_cost", "real")],
+        "pk": [],
+        "fks": [],
+    },
+    "Output_Emissions": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("t_periods", "integer"),
+                 ("emissions_comm", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("emissions", "real")],
+        "pk": ["regions", "scenario", "t_periods", "emissions_comm", "tech",
+               "vintage"],
+        "fks": [("vintage", "time_periods", "t_periods"),
+                ("emissions_comm", "EmissionActivity", "emis_comm"),
+                ("tech", "technologies", "tech"),
+                ("sector", "sector_labels", "sector"),
+                ("t_periods", "time_periods", "t_periods")],
+    },
+    "Output_Curtailment": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("t_periods", "integer"),
+                 ("t_season", "text"),
+                 ("t_day", "text"),
+                 ("input_comm", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("output_comm", "text"),
+                 ("curtailment", "real")],
+        "pk": ["regions", "scenario", "t_periods", "t_season", "t_day",
+               "input_comm", "tech", "vintage", "output_comm"],
+        "fks": [("tech", "technologies", "tech"),
+                ("vintage", "time_periods", "t_periods"),
+                ("input_comm", "commodities", "comm_name"),
+                ("output_comm", "commodities", "comm_name"),
+                ("t_periods", "time_periods", "t_periods"),
+                ("t_season", "time_periods", "t_periods"),
+                ("t_day", "time_of_day", "t_day")],
+    },
+    "Output_Costs": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("output_name", "text"),
+                 ("tech", "text"),
+                 ("vintage", "integer"),
+                 ("output_cost", "real")],
+        "pk": ["regions", "scenario", "output_name", "tech", "vintage"],
+        "fks": [("vintage", "time_periods", "t_periods"),
+                ("sector", "sector_labels", "sector"),
+                ("tech", "technologies", "tech")],
+    },
+    "Output_Duals": {
+        "cols": [("constraint_name", "text"),
+                 ("scenario", "text"),
+                 ("dual", "real")],
+        "pk": ["constraint_name", "scenario"],
+        "fks": [],
+    },
+    "Output_CapacityByPeriodAndTech": {
+        "cols": [("regions", "text"),
+                 ("scenario", "text"),
+                 ("sector", "text"),
+                 ("t_periods", "integer"),
+                 ("tech", "text"),
+                 ("capacity", "real")],
+        "pk": ["regions", "scenario", "t_periods", "tech"],
+        "fks": [("sector", "sector_labels", "sector"),
+                ("t_periods", "time_periods", "t_periods"),
+                ("tech", "technologies", "tech")],
+    },
+}
+
+
+def emit_ddl(name, spec, with_pk=True):
+    """
+    Compiles a table description from ``SCHEMAS`` into a CREATE TABLE
+    statement.
+
+    Parameters
+    ----------
+    name : string
+        The name of the table.
+    spec : dictionary
+        The table description. ``cols`` is a list of (column, type) pairs,
+        ``pk`` a list of primary key columns and ``fks`` a list of
+        (column, table, column) foreign keys.
+    with_pk : boolean, optional
+        Whether to emit the primary key. Default is True.
+
+    Returns
+    -------
+    ddl : string
+        The CREATE TABLE statement.
+    """
+    lines = [f'"{col}"\t{kind}' for col, kind in spec["cols"]]
+    if with_pk and spec.get("pk"):
+        key = ",".join(f'"{col}"' for col in spec["pk"])
+        lines.append(f"PRIMARY KEY({key})")
+    lines += [f'FOREIGN KEY("{col}") REFERENCES "{table}"("{ref}")'
+              for col, table, ref in spec.get("fks", [])]
+    body = ",\n\t".join(lines)
+    return f'CREATE TABLE "{name}" (\n\t{body}\n);'
 
 
-def establish_connection(output_db):
+TABLE_DDL.update((name, emit_ddl(name, spec))
+                 for name, spec in SCHEMAS.items())
+
+# Large tables that may be loaded without their primary key. The key is
+# enforced afterwards by a unique index (see ``create_bulk_indexes``).
+# Each must be described in ``SCHEMAS``.
+BULK_TABLES = ("CapacityFactorTech",)
+
+_INSERT_PRM = 'INSERT INTO "PlanningReserveMargin" VALUES (?,?)'
+_INSERT_TECH_RESERVE = 'INSERT INTO "tech_reserve" VALUES (?,?)'
+
+
+def establish_connection(output_db, durable=False):
     """
     Establishes connection with sqlite3 database.
     If the file does not exist, it will be created.
@@ -16,23 +506,198 @@ def establish_connection(output_db):
     ----------
     output_db : string
         The full path to the SQLite database.
+    durable : boolean, optional
+        Passed to ``configure_connection``. Default is False.
 
     Returns
     -------
     conn : sqlite3 connection
         An object used to interact with a specific SQLite
-        database.
+        database. The connection is in autocommit mode, so
+        transactions are opened explicitly with ``transaction``.
     """
     conn = None
     try:
-        conn = sqlite3.connect(output_db)
+        conn = sqlite3.connect(output_db,
+                               isolation_level=None,
+                               cached_statements=256)
     except BaseException:
         print("Database connection failed. Writing to sql file instead.")
         print("Warning: SQL writing has not been implemented.")
+        return conn
+
+    try:
+        configure_connection(conn, durable=durable)
+    except BaseException:
+        conn.close()
+        raise
 
     return conn
 
 
+def configure_connection(connector, durable=False):
+    """
+    Tunes an sqlite3 connection for bulk loading. The database is
+    rebuilt from the input file on every run, so durability is traded
+    for fewer fsyncs. The connection is the only one touching the file
+    while it is built, so it holds the lock for its whole lifetime and
+    reads pages through a memory map.
+
+    Note: ``page_size`` only takes effect on a new, empty database and
+    must be set before the switch to WAL. ``locking_mode`` is set only
+    after the database has been read in WAL mode, otherwise SQLite
+    refuses to return it to ``NORMAL`` (see ``release_lock``).
+
+    Parameters
+    ----------
+    connector : sqlite3 connection object
+        An object for connecting to a specific SQLite
+        database.
+    durable : boolean, optional
+        If True, every commit is synced to disk (``synchronous = FULL``).
+        Default is False.
+    """
+    synchronous = 'FULL' if durable else 'NORMAL'
+    connector.executescript(f"""
+                            PRAGMA page_size = 8192;
+                            PRAGMA journal_mode = WAL;
+                            PRAGMA synchronous = {synchronous};
+                            PRAGMA temp_store = MEMORY;
+                            PRAGMA cache_size = -65536;
+                            SELECT count(*) FROM sqlite_master;
+                            PRAGMA locking_mode = EXCLUSIVE;
+                            PRAGMA mmap_size = 268435456;
+                            """)
+    return
+
+
+def release_lock(connector):
+    """
+    Returns a connection to ``NORMAL`` locking mode once the database
+    has been built, so that other processes (e.g. Temoa) can open the
+    file while the connection is still open. SQLite only drops the
+    exclusive lock on the next access, hence the read.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection object
+        Used to connect to and write to an sqlite database.
+    """
+    connector.execute("PRAGMA locking_mode = NORMAL")
+    connector.execute("SELECT count(*) FROM sqlite_master").fetchone()
+    return
+
+
+@contextlib.contextmanager
+def transaction(connector):
+    """
+    Runs the enclosed statements in a single transaction. The
+    transaction is committed when the block exits and rolled back if
+    it raises, so a failed build does not leave a partial database.
+    ``BEGIN IMMEDIATE`` takes the write lock up front rather than on
+    the first write.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection object
+        Used to connect to and write to an sqlite database.
+    """
+    connector.execute("BEGIN IMMEDIATE")
+    try:
+        yield connector
+    except BaseException:
+        # SQLite may already have rolled back (e.g. on a full disk), and
+        # a second ROLLBACK would mask the original error
+        if connector.in_transaction:
+            connector.execute("ROLLBACK")
+        raise
+    connector.execute("COMMIT")
+
+
+def create_schema(connector, fast_load=False):
+    """
+    Creates every table in ``TABLE_DDL``. This includes the empty
+    output tables that Temoa fills in. The ``create_*`` functions only
+    insert rows, so this must be called before any of them.
+
+    Note: the statements are run one at a time rather than with
+    ``executescript``, which would commit any pending transaction.
+    This lets the schema be created inside the build transaction.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection or cursor object
+        Used to connect to and write to an sqlite database.
+    fast_load : boolean, optional
+        If True, the tables in ``BULK_TABLES`` are created without their
+        primary key, so that inserts do not maintain an index row by
+        row. ``create_bulk_indexes`` must be called once they are
+        loaded. Default is False.
+    """
+    for name, ddl in TABLE_DDL.items():
+        if fast_load and name in BULK_TABLES:
+            ddl = emit_ddl(name, SCHEMAS[name], with_pk=False)
+        connector.execute(ddl)
+
+    return
+
+
+def create_bulk_indexes(connector):
+    """
+    Creates a unique index over the primary key of each table in
+    ``BULK_TABLES``.
+    This restores the primary key constraint dropped by
+    ``create_schema(fast_load=True)``, sorting the rows once instead of
+    on every insert.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection or cursor object
+        Used to connect to and write to an sqlite database.
+    """
+    for name in BULK_TABLES:
+        columns = ",".join(f'"{col}"' for col in SCHEMAS[name]["pk"])
+        connector.execute(f'CREATE UNIQUE INDEX "idx_{name}" '
+                          f'ON "{name}"({columns})')
+
+    return
+
+
+def _insert_rows(connector, table, rows, n_columns):
+    """
+    Inserts rows into a table with multi-row
+    ``INSERT INTO ... VALUES (...),(...)`` statements. This steps the
+    sqlite virtual machine once per chunk of rows rather than once per
+    row. The statement for a full chunk is built once and reused.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection or cursor object
+        Used to connect to and write to an sqlite database.
+    table : string
+        The name of the table.
+    rows : list of tuples
+        The rows to insert. Every row must have ``n_columns`` values.
+    n_columns : integer
+        The number of columns in the table.
+    """
+    # sqlite versions before 3.32 allow at most 999 parameters
+    chunk_len = max(1, 999 // n_columns)
+    row_values = '(' + ','.join('?' * n_columns) + ')'
+    prefix = f'INSERT INTO "{table}" VALUES '
+    full_command = prefix + ','.join([row_values] * chunk_len)
+
+    for start in range(0, len(rows), chunk_len):
+        chunk = rows[start:start + chunk_len]
+        if len(chunk) == chunk_len:
+            command = full_command
+        else:
+            command = prefix + ','.join([row_values] * len(chunk))
+        connector.execute(command, list(itertools.chain.from_iterable(chunk)))
+
+    return
+
+
 def create_time_season(connector, N_seasons):
     """
     This function writes the "time_season" table to an sqlite
@@ -40,7 +705,7 @@ def create_time_season(connector, N_seasons):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         An object for connecting to a specific SQLite
         database.
 
@@ -49,25 +714,15 @@ def create_time_season(connector, N_seasons):
 
     Returns
     -------
-    table_command : string
-        The command for generating the "time_season" table.
+    seasons : list
+        The season labels, e.g. ``['S1', 'S2', ...]``.
     """
 
-    cursor = connector.cursor()
+    insert_command = 'INSERT INTO "time_season" VALUES (?)'
 
-    table_command = """CREATE TABLE "time_season" (
-                    	"t_season"	text,
-                    	PRIMARY KEY("t_season")
-                    );"""
-    insert_command = """
-                     INSERT INTO "time_season" VALUES (?)
-                     """
+    seasons = [f'S{i+1}' for i in range(N_seasons)]
 
-    seasons = [[f'S{i+1}'] for i in range(N_seasons)]
-
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, seasons)
-    connector.commit()
+    connector.executemany(insert_command, ((s,) for s in seasons))
 
     return seasons
 
@@ -83,43 +738,28 @@ def create_time_periods(connector, future_years, existing_years):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         An object for connecting to a specific SQLite
         database.
 
     future_years : list or array
         The yearly resolution of the energy system model.
+    """
 
-    Returns
-    -------
-    table_command : string
-        The command for generating the "time_periods" table.
-    """
-
-    table_command = """CREATE TABLE "time_periods" (
-                    	"t_periods"	integer,
-                    	"flag"	text,
-                    	PRIMARY KEY("t_periods"),
-                    	FOREIGN KEY("flag") REFERENCES "time_period_labels"("t_period_labels")
-                    );"""
-    insert_command = """
-                     INSERT INTO "time_periods" VALUES(?,?)
-                     """
-    # breakpoint()
+    insert_command = 'INSERT INTO "time_periods" VALUES(?,?)'
+    future_years = np.asarray(future_years, dtype=np.int64).tolist()
+    existing_years = np.asarray(existing_years, dtype=np.int64).tolist()
     if len(existing_years) == 0:
-        past_horizon = [(int(future_years[0] - 1), 'e')]
+        past_horizon = [(future_years[0] - 1, 'e')]
     else:
-        past_horizon = [(int(year), 'e') for year in existing_years]
-    future_horizon = [(int(year), 'f') for year in future_years]
+        past_horizon = [(year, 'e') for year in existing_years]
+    future_horizon = [(year, 'f') for year in future_years]
     # set boundary year
-    future_horizon.append((int(future_years[-1] + 1), 'f'))
+    future_horizon.append((future_years[-1] + 1, 'f'))
     entries = past_horizon + future_horizon
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
-    return table_command
+    connector.executemany(insert_command, entries)
+    return
 
 
 def create_time_period_labels(connector):
@@ -129,33 +769,16 @@ def create_time_period_labels(connector):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         An object for connecting to a specific SQLite
         database.
-
-    Returns
-    -------
-    table_command : string
-        The command for generating the "time_period_labels" table.
     """
 
-    table_command = """CREATE TABLE "time_period_labels" (
-                	"t_period_labels"	text,
-                	"t_period_labels_desc"	text,
-                	PRIMARY KEY("t_period_labels")
-                    );"""
     labels = [('e', 'existing vintages'), ('f', 'future vintages')]
 
-    insert_command = """
-                     INSERT INTO "time_period_labels" VALUES(?,?)
-                     """
+    _insert_rows(connector, "time_period_labels", labels, 2)
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, labels)
-    connector.commit()
-
-    return table_command
+    return
 
 
 def create_time_of_day(connector, N_hours):
@@ -165,7 +788,7 @@ def create_time_of_day(connector, N_hours):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         An object for connecting to a specific SQLite
         database.
 
@@ -174,74 +797,43 @@ def create_time_of_day(connector, N_hours):
 
     Returns
     -------
-    table_command : string
-        The command for generating the "time_of_day" table.
+    times_of_day : list
+        The time of day labels, e.g. ``['H1', 'H2', ...]``.
     """
 
-    table_command = """CREATE TABLE "time_of_day" (
-                    	"t_day"	text,
-                    	PRIMARY KEY("t_day")
-                    );"""
-
-    insert_command = """
-                     INSERT INTO "time_of_day" VALUES (?)
-                     """
+    insert_command = 'INSERT INTO "time_of_day" VALUES (?)'
 
-    times_of_day = [[f'H{i+1}'] for i in range(N_hours)]
+    times_of_day = [f'H{i+1}' for i in range(N_hours)]
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, times_of_day)
-    connector.commit()
+    connector.executemany(insert_command, ((h,) for h in times_of_day))
 
     return times_of_day
 
 
-def create_segfrac(connector, segfrac, seasons, hours):
+def create_segfrac(connector, segfrac):
     """
     Generates the "SegFrac" table for the Temoa database.
     This table defines what fraction of a year is represented
-    by each time slice.
+    by each time slice. The time slices are read back from the
+    "time_season" and "time_of_day" tables, so those must be written
+    first.
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
     segfrac : float
         The fraction-of-a-year represented by each time slice.
-    seasons : list
-        The list of seasons in the simulation.
-    hours : list
-        The list of hours in the simulation.
+    """
 
-    Returns
-    -------
-    table_command : string
-        The command for generating the "SegFrac" table.
-    """
-
-    table_command = """CREATE TABLE "SegFrac" (
-                    	"season_name"	text,
-                    	"time_of_day_name"	text,
-                    	"segfrac"	real CHECK("segfrac" >= 0 AND "segfrac" <= 1),
-                    	"segfrac_notes"	text,
-                    	PRIMARY KEY("season_name","time_of_day_name"),
-                    	FOREIGN KEY("season_name") REFERENCES "time_season"("t_season"),
-                    	FOREIGN KEY("time_of_day_name") REFERENCES "time_of_day"("t_day")
-                    );"""
-    insert_command = """
-                     INSERT INTO "SegFrac" VALUES (?,?,?,?)
-                     """
-    time_slices = itertools.product(seasons, hours)
-    entries = [(ts[0][0], ts[1][0], segfrac, 'fraction of year')
-               for ts in time_slices]
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
-
-    return table_command
+    insert_command = ('INSERT INTO "SegFrac" '
+                      'SELECT t_season, t_day, ?, ? '
+                      'FROM time_season CROSS JOIN time_of_day '
+                      'ORDER BY time_season.rowid, time_of_day.rowid')
+
+    connector.execute(insert_command, (segfrac, 'fraction of year'))
+
+    return
 
 
 def create_commodity_labels(connector):
@@ -250,31 +842,14 @@ def create_commodity_labels(connector):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
+    """
 
-    Returns
-    -------
-    table_command : string
-        The command for generating the "commodity_labels" table.
-    """
-    table_command = """CREATE TABLE "commodity_labels" (
-                       "comm_labels"	text,
-                       "comm_labels_desc"	text,
-                       PRIMARY KEY("comm_labels")
-                    );
-                    """
-
-    insert_command = """
-                     INSERT INTO "commodity_labels" VALUES (?,?)
-                     """
     labels = [("p", "physical commodity"),
               ("d", "demand commodity"), ("e", "emissions commodity")]
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, labels)
-    connector.commit()
+    _insert_rows(connector, "commodity_labels", labels, 2)
 
     return
 
@@ -285,7 +860,7 @@ def create_commodities(connector, comm_data):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
 
     comm_data : dictionary
@@ -293,34 +868,17 @@ def create_commodities(connector, comm_data):
         * demand
         * resources
         * emissions
-
-    Returns
-    -------
-    table_command : string
-        The command for generating the "commodities" table.
-    """
-    table_command = """CREATE TABLE "commodities" (
-                    	"comm_name"	text,
-                    	"flag"	text,
-                    	"comm_desc"	text,
-                    	PRIMARY KEY("comm_name"),
-                    	FOREIGN KEY("flag") REFERENCES "commodity_labels"("comm_labels")
-                    );"""
-    insert_command = """
-                     INSERT INTO "commodities" VALUES(?,?,?)
-                     """
+    """
+    insert_command = 'INSERT INTO "commodities" VALUES(?,?,?)'
     demand_entries = [comm._db_entry() for comm in comm_data['demand']]
     resource_entries = [comm._db_entry() for comm in comm_data['resources']]
     emission_entries = [comm._db_entry() for comm in comm_data['emissions']]
 
     labels = demand_entries + resource_entries + emission_entries
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, labels)
-    connector.commit()
+    connector.executemany(insert_command, labels)
 
-    return table_command
+    return
 
 
 def create_regions(connector, regions):
@@ -329,32 +887,17 @@ def create_regions(connector, regions):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
 
     regions : list
         A list of strings containing the unique regions in the
         model.
-
-    Returns
-    -------
-    table_command : string
-        The command for generating the "regions" table.
-    """
-    table_command = """CREATE TABLE "regions" (
-                    	"regions"	TEXT,
-                    	"region_note"	TEXT,
-                    	PRIMARY KEY("regions")
-                    );"""
-    insert_command = """
-                     INSERT INTO "regions" VALUES (?,?)
-                     """
+    """
+    insert_command = 'INSERT INTO "regions" VALUES (?,?)'
     labels = [(r, '') for r in regions]
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, labels)
-    connector.commit()
+    connector.executemany(insert_command, labels)
 
     return
 
@@ -365,7 +908,7 @@ def create_demand_table(connector, demand_list, years):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
 
     demand_list : list
@@ -373,46 +916,30 @@ def create_demand_table(connector, demand_list, years):
 
     years : list or array
         A list of the years in the model simulation.
+    """
 
-    Returns
-    -------
-    table_command : string
-        The command for generating the "demand" table.
-    """
-    table_command = """CREATE TABLE "Demand" (
-                    	"regions"	text,
-                    	"periods"	integer,
-                    	"demand_comm"	text,
-                    	"demand"	real,
-                    	"demand_units"	text,
-                    	"demand_notes"	text,
-                    	PRIMARY KEY("regions","periods","demand_comm"),
-                    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("demand_comm") REFERENCES "commodities"("comm_name")
-                    );"""
-
-    insert_command = """
-                    INSERT INTO "Demand" VALUES (?,?,?,?,?,?)
-    """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
+    insert_command = 'INSERT INTO "Demand" VALUES (?,?,?,?,?,?)'
+
+    entries = []
     # loops over each commodity (electricity, steam, h2, etc.)
+    periods = np.asarray(years, dtype=np.int64).tolist()
     for demand_comm in demand_list:
         demand_dict = demand_comm.demand
+        comm_name = demand_comm.comm_name
+        units = demand_comm.units
         # loops over each region where the commodity is defined
         for region in demand_dict:
             data = demand_dict[region]
             db_entry = [(region,
-                         int(y),
-                         demand_comm.comm_name,
+                         y,
+                         comm_name,
                          d,
-                         demand_comm.units,
-                         '') for d, y in zip(data, years)]
-            cursor.executemany(insert_command, db_entry)
+                         units,
+                         '') for d, y in zip(data, periods)]
+            entries += db_entry
 
-    connector.commit()
-    return table_command
+    connector.executemany(insert_command, entries)
+    return
 
 
 def create_demand_specific_distribution(connector,
@@ -428,7 +955,7 @@ def create_demand_specific_distribution(connector,
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
     demand_list : list of DemandCommodity objects
         The list of objects that store information about
@@ -437,50 +964,29 @@ def create_demand_specific_distribution(connector,
         The list of seasons in the simulation.
     hours : list
         The list of hours in the simulation.
+    """
 
-    Returns
-    -------
-    table_command : string
-        The command for creating the SQLite table.
-    """
-    table_command = """CREATE TABLE "DemandSpecificDistribution" (
-                	"regions"	text,
-                	"season_name"	text,
-                	"time_of_day_name"	text,
-                	"demand_name"	text,
-                	"dds"	real CHECK("dds" >= 0 AND "dds" <= 1),
-                	"dds_notes"	text,
-                	PRIMARY KEY("regions","season_name","time_of_day_name","demand_name"),
-                	FOREIGN KEY("season_name") REFERENCES "time_season"("t_season"),
-                	FOREIGN KEY("time_of_day_name") REFERENCES "time_of_day"("t_day"),
-                	FOREIGN KEY("demand_name") REFERENCES "commodities"("comm_name")
-                    );"""
-    insert_command = """
-                     INSERT INTO "DemandSpecificDistribution" VALUES (?,?,?,?,?,?)
-                     """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
+    # materialized once so every region iterates the full set of slices
+    time_slices = list(itertools.product(hours, seasons))
     entries = []
     for demand_comm in demand_list:
         demand_dict = demand_comm.distribution
+        comm_name = demand_comm.comm_name
+        units = demand_comm.units
         # loops over each region where the commodity is defined
         for region in demand_dict:
-            time_slices = itertools.product(hours, seasons)
             data = demand_dict[region]
             db_entry = [
                 (region,
-                 ts[0][0],
-                 ts[1][0],
-                 demand_comm.comm_name,
+                 season,
+                 hour,
+                 comm_name,
                  d,
-                 demand_comm.units) for d,
-                ts in zip(data, time_slices)]
+                 units) for d,
+                (season, hour) in zip(data, time_slices)]
             entries += db_entry
-    cursor.executemany(insert_command, entries)
-    connector.commit()
-    return table_command
+    _insert_rows(connector, "DemandSpecificDistribution", entries, 6)
+    return
 
 
 def create_technology_labels(connector):
@@ -489,33 +995,16 @@ def create_technology_labels(connector):
 
     Parameters
     ----------
-    connector : sqlite3 connection object
+    connector : sqlite3 connection or cursor object
         Used to connect to and write to an sqlite database.
-
-    Returns
-    -------
-    table_command : string
-        The command for generating the "commodity_labels" table.
     """
-    table_command = """CREATE TABLE "technology_labels" (
-    	"tech_labels"	text,
-    	"tech_labels_desc"	text,
-    	PRIMARY KEY("tech_labels")
-    );
-                    """
 
-    insert_command = """
-                     INSERT INTO "technology_labels" VALUES (?,?)
-                     """
     labels = [("p", "production technology"),
               ("pb", "baseload production technology"),
               ("ps", "storage production technology"),
               ("r", "resource technology")]
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, labels)
-    connector.commit()
+    _insert_rows(connector, "technology_labels", labels, 2)
 
     return
 
@@ -524,22 +1013,10 @@ def create_sectors(connector, sector_list):
     """
     Creates the ``sectors`` table in Temoa.
     """
-    table_command = """
-                    CREATE TABLE "sector_labels" (
-                    "sector"	text,
-                    PRIMARY KEY("sector")
-                    );"""
-
-    insert_command = """
-                     INSERT INTO "sector_labels" VALUES (?)
-                     """
 
-    sectors = [[s] for s in sector_list]
+    insert_command = 'INSERT INTO "sector_labels" VALUES (?)'
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, sectors)
-    connector.commit()
+    connector.executemany(insert_command, ((s,) for s in sector_list))
 
     return
 
@@ -550,35 +1027,19 @@ def create_technologies(connector, technology_list):
 
     Parameters
     ----------
-    connector : sqlite connector
+    connector : sqlite3 connection or cursor object
         The connection to an sqlite database
 
     technology_list : list of ``Technology`` objects
         All of the technologies initialized in the input file
     """
 
-    table_command = """
-                    CREATE TABLE "technologies" (
-                    "tech"	text,
-                    "flag"	text,
-                    "sector"	text,
-                    "tech_desc"	text,
-                    "tech_category"	text,
-                    PRIMARY KEY("tech"),
-                    FOREIGN KEY("flag") REFERENCES "technology_labels"("tech_labels"),
-                    FOREIGN KEY("sector") REFERENCES "sector_labels"("sector")
-                    );"""
-    insert_command = """
-                     INSERT INTO "technologies" VALUES (?,?,?,?,?)
-                     """
+    insert_command = 'INSERT INTO "technologies" VALUES (?,?,?,?,?)'
     tech_entries = [tech._db_entry() for tech in technology_list]
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, tech_entries)
-    connector.commit()
+    connector.executemany(insert_command, tech_entries)
 
-    return table_command
+    return
 
 
 def create_efficiency(connector, technology_list, future):
@@ -586,55 +1047,38 @@ def create_efficiency(connector, technology_list, future):
     This function writes the efficiency table in Temoa.
     """
 
-    table_command = """CREATE TABLE "Efficiency" (
-                    	"regions"	text,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_comm"	text,
-                    	"efficiency"	real CHECK("efficiency" > 0),
-                    	"eff_notes"	text,
-                    	PRIMARY KEY("regions","input_comm","tech","vintage","output_comm"),
-                    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name")
-                    );"""
-    insert_command = """
-                    INSERT INTO "Efficiency" VALUES (?,?,?,?,?,?,?)
-                     """
+    insert_command = 'INSERT INTO "Efficiency" VALUES (?,?,?,?,?,?,?)'
     entries = []
     for tech in technology_list:
         # loop through regions
         for place in tech.regions:
 
-            lifetime = tech.tech_lifetime[place]
             in_comm = tech.input_comm[place]
             out_comm = tech.output_comm[place]
-
-            # check for existing capacity
-            try:
-                years = list(
-                    tech.existing_capacity[place].keys()) + list(future)
-                years = [y for y in years if (future[0] - y) < lifetime]
-            except BaseException:
-                years = future
+            years = _tech_vintages(tech, place, future)
+
+            tech_name = str(tech.tech_name)
+            output_name = str(out_comm.comm_name)
+            vintages = years.tolist()
+
+            def _rows(comm, eff):
+                input_name = str(comm.comm_name)
+                return [(place,
+                         input_name,
+                         tech_name,
+                         vintage,
+                         output_name,
+                         eff,
+                         'NULL'
+                         ) for vintage in vintages]
 
             # one input and one output
-            if (type(in_comm) in comm_types) and (
-                    type(out_comm) in comm_types):
-                data = [(place,
-                         str(in_comm.comm_name),
-                         str(tech.tech_name),
-                         int(year),
-                         str(out_comm.comm_name),
-                         tech.efficiency[place],
-                         'NULL'
-                         ) for year in years]
-                entries += data
+            if isinstance(in_comm, Commodity) and (
+                    isinstance(out_comm, Commodity)):
+                entries += _rows(in_comm, tech.efficiency[place])
 
             # if the technology has two or more inputs and one output
-            elif (isinstance(in_comm, list)) and (type(out_comm) in comm_types):
+            elif isinstance(in_comm, list) and isinstance(out_comm, Commodity):
                 N_inputs = len(in_comm)
                 assert N_inputs == len(tech.efficiency[place]), "Mismatched number of inputs and efficiencies"
                 # pass to tech_input_split
@@ -646,89 +1090,50 @@ def create_efficiency(connector, technology_list, future):
                                         in_comm,
                                         eff_list)
                 tot_eff=np.array(eff_list).sum()
-                for comm, eff in zip(in_comm, eff_list):
-                    data = [(place,
-                             str(comm.comm_name),
-                             str(tech.tech_name),
-                             int(year),
-                             str(out_comm.comm_name),
-                             # 1.0/N_inputs,
-                             1.0/tot_eff,
-                             'NULL'
-                             ) for year in years]
-                    entries += data
-            # elif (isinstance(tech.output_comm[place], dict)):
-            #     pass
-            # elif (isinstance(tech.input_comm[place], list)):
-            #     pass
-            # # if the technology has two or more inputs
-            # elif (isinstance(tech.input_comm[place], dict)):
-            #     pass
-            #
-            # # if the technology has two or more inputs and outputs
-            # elif ((isinstance(tech.input_comm[place], 'list')) and
-            #       (isinstance(tech.output_comm[place], 'list'))):
-            #     pass
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
-
-    return table_command
+                for comm in in_comm:
+                    entries += _rows(comm, 1.0/tot_eff)
+
+    connector.executemany(insert_command, entries)
+
+    return
 
 
 def create_existing_capacity(connector, technology_list, time_horizon):
     """
     Writes the ``ExistingCapacity`` table.
     """
-
-    table_command = """CREATE TABLE "ExistingCapacity" (
-                    	"regions"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"exist_cap"	real,
-                    	"exist_cap_units"	text,
-                    	"exist_cap_notes"	text,
-                    	PRIMARY KEY("regions","tech","vintage"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods")
-                    );"""
-
-    insert_command = """
-                     INSERT INTO "ExistingCapacity" VALUES (?,?,?,?,?,?)
-                     """
+    insert_command = 'INSERT INTO "ExistingCapacity" VALUES (?,?,?,?,?,?)'
 
     entries = []
+    first_year = time_horizon[0]
     for tech in technology_list:
-        first_year = time_horizon[0]
+        tech_name = tech.tech_name
+        units = tech.units
         for place in tech.regions:
-            lifetime = tech.tech_lifetime[place]
-            try:
-                years = np.array(list(tech.existing_capacity[place].keys()))
-            except BaseException:
+            if place not in tech.existing_capacity:
                 continue
+            capacity = tech.existing_capacity[place]
             # only keep the vintages that will exist in the first sim year
-            years = years[(first_year - years) < lifetime]
-            # caps = list(tech.existing_capacity[place].values())
-
+            cutoff = first_year - tech.tech_lifetime[place]
+            kept = [(year, cap) for year, cap in capacity.items()
+                    if year > cutoff]
+            if not kept:
+                continue
+            # the years may be numpy integers (e.g. from the EIA data),
+            # which sqlite3 cannot bind, so the column is cast in bulk
+            years, caps = zip(*kept)
+            years = np.asarray(years, dtype=np.int64).tolist()
             data = [(place,
-                     tech.tech_name,
-                     int(year),
-                     tech.existing_capacity[place][year],
-                     tech.units,
-                     '') for year in years]
+                     tech_name,
+                     year,
+                     cap,
+                     units,
+                     '') for year, cap in zip(years, caps)]
             entries += data
 
-    if len(entries) > 0:
-        cursor = connector.cursor()
-        cursor.execute(table_command)
-        cursor.executemany(insert_command, entries)
-        connector.commit()
-    else:
-        return table_command
+    connector.executemany(insert_command, entries)
 
-    return table_command
+    return
 
 
 def create_lifetime_tech(connector, technology_list):
@@ -738,127 +1143,153 @@ def create_lifetime_tech(connector, technology_list):
     TO DO: Update this function to handle technologies with
     technology lifetimes that vary by region.
     """
-    table_command = """CREATE TABLE "LifetimeTech" (
-                    	"regions"	text,
-                    	"tech"	text,
-                    	"life"	real,
-                    	"life_notes"	text,
-                    	PRIMARY KEY("regions","tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
-
-    insert_command = """
-                     INSERT INTO "LifetimeTech" VALUES (?,?,?,?)
-                     """
+
+    insert_command = 'INSERT INTO "LifetimeTech" VALUES (?,?,?,?)'
     entries = []
 
     for tech in technology_list:
         tech_name = tech.tech_name
+        lifetimes = tech.tech_lifetime
         data = [(place,
                  tech_name,
-                 tech.tech_lifetime[place],
+                 lifetimes[place],
                  'NULL') for place in tech.regions]
 
         entries += data
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
 
-    return table_command
+    return
 
 
-def create_variable_cost(connector, technology_list, time_horizon):
+def _tech_vintages(tech, place, time_horizon):
     """
-    This function writes the variable cost table in Temoa. The
-    ``cost_variable`` parameter in ``Technology`` can be either a constant
-    or a dictionary. If the parameter is constant, then the cost will
-    be applied to all vintages for all years. If the parameter is a dictionary
-    then the cost for each *year* will be applied to all vintages in that year.
-    Thus a dictionary should have keys for each *year* in the simulation.
-    Existing capacity will not be differentiated.
-    For example, a nuclear power plant built in 1988 will have the same variable
-    cost in 2020 as a nuclear plant built in 2015 and 2020.
+    Returns the vintages of a technology in a region: the existing
+    vintages that survive to the first simulation year, followed by
+    the simulation years.
+
+    Parameters
+    ----------
+    tech : ``Technology`` object
+        The technology.
+    place : string
+        The region.
+    time_horizon : list or array
+        The simulation years.
+
+    Returns
+    -------
+    vintages : sorted numpy array of integers
+    """
+    future = np.asarray(time_horizon, dtype=np.int64)
+    existing = tech.existing_capacity.get(place)
+    if not existing:
+        return future
+    existing = np.fromiter(existing.keys(), dtype=np.int64,
+                           count=len(existing))
+    existing = existing[(future[0] - existing) < tech.tech_lifetime[place]]
+    return np.sort(np.concatenate([existing, future]))
+
+
+def _operating_vintages(vintages, year, lifetime):
+    """
+    Returns the vintages that have been built and have not yet retired
+    in a given year, i.e. ``0 <= year - vintage < lifetime``.
 
     Parameters
     ----------
-    connector : sqlite connector
+    vintages : sorted numpy array
+        The vintages of a technology in ascending order.
+    year : integer
+        The simulation year.
+    lifetime : float
+        The lifetime of the technology.
+
+    Returns
+    -------
+    operating : numpy array
+        A slice of ``vintages``.
+    """
+    first = np.searchsorted(vintages, year - lifetime, side='right')
+    last = np.searchsorted(vintages, year, side='right')
+    return vintages[first:last]
+
+
+def _vintage_cost_rows(technology_list, cost_attr, time_horizon):
+    """
+    Yields the rows of a per-vintage cost table (``CostVariable`` or
+    ``CostFixed``) one at a time, so that ``executemany`` can consume
+    them without building an intermediate list.
 
+    Parameters
+    ----------
     technology_list : list of ``Technology`` objects
         All of the technologies initialized in the input file
+    cost_attr : string
+        The name of the cost attribute, e.g. ``'cost_variable'``.
+    time_horizon : list or array
+        The simulation years.
     """
-    table_command = """CREATE TABLE "CostVariable" (
-                	"regions"	text NOT NULL,
-                	"periods"	integer NOT NULL,
-                	"tech"	text NOT NULL,
-                	"vintage"	integer NOT NULL,
-                	"cost_variable"	real,
-                	"cost_variable_units"	text,
-                	"cost_variable_notes"	text,
-                	PRIMARY KEY("regions","periods","tech","vintage"),
-                	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
-                );"""
-
-    insert_command = """
-                     INSERT INTO "CostVariable" VALUES (?,?,?,?,?,?,?)
-                     """
-    entries = []
+    periods = np.asarray(time_horizon, dtype=np.int64).tolist()
     for tech in technology_list:
+        tech_costs = getattr(tech, cost_attr)
         # check that cost exists
-        if len(tech.cost_variable) > 0:
-            pass
-        else:
+        if len(tech_costs) == 0:
             continue
 
         # loop through regions
         for place in tech.regions:
             # check if particular region has cost_data
             try:
-                cost_variable = tech.cost_variable[place]
-                # print(f'Success. Cost variable is {cost_variable}')
+                cost = tech_costs[place]
             except BaseException:
                 continue
             lifetime = float(tech.tech_lifetime[place])
-            # if there are existing vintages of the technology
-            try:
-                years = list(tech.existing_capacity[place].keys()) + \
-                    list(time_horizon)
-                years = [y for y in years if (time_horizon[0] - y) < lifetime]
-            except BaseException:
-                years = time_horizon
-            # generate future/vintage pairs
-            year_pairs = itertools.product(time_horizon, years)
-            if isinstance(cost_variable, dict):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_variable[year],
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-            elif (isinstance(cost_variable, float)) or (isinstance(cost_variable, int)):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_variable,
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+            if isinstance(cost, dict):
+                year_costs = [cost[year] for year in time_horizon]
+            elif isinstance(cost, (float, int)):
+                year_costs = [cost] * len(time_horizon)
+            else:
+                continue
+            vintages = _tech_vintages(tech, place, time_horizon)
+            tech_name = tech.tech_name
+            for year, year_cost in zip(periods, year_costs):
+                operating = _operating_vintages(vintages, year, lifetime)
+                for vintage in operating.tolist():
+                    yield (place,
+                           year,
+                           tech_name,
+                           vintage,
+                           year_cost,
+                           "",
+                           "")
+
+
+def create_variable_cost(connector, technology_list, time_horizon):
+    """
+    This function writes the variable cost table in Temoa. The
+    ``cost_variable`` parameter in ``Technology`` can be either a constant
+    or a dictionary. If the parameter is constant, then the cost will
+    be applied to all vintages for all years. If the parameter is a dictionary
+    then the cost for each *year* will be applied to all vintages in that year.
+    Thus a dictionary should have keys for each *year* in the simulation.
+    Existing capacity will not be differentiated.
+    For example, a nuclear power plant built in 1988 will have the same variable
+    cost in 2020 as a nuclear plant built in 2015 and 2020.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection or cursor object
+
+    technology_list : list of ``Technology`` objects
+        All of the technologies initialized in the input file
+    """
 
-    return table_command
+    insert_command = 'INSERT INTO "CostVariable" VALUES (?,?,?,?,?,?,?)'
+    rows = _vintage_cost_rows(technology_list, 'cost_variable', time_horizon)
+    connector.executemany(insert_command, rows)
+
+    return
 
 
 def create_invest_cost(connector, technology_list, time_horizon):
@@ -867,27 +1298,14 @@ def create_invest_cost(connector, technology_list, time_horizon):
 
     Parameters
     ----------
-    connector : sqlite connector
+    connector : sqlite3 connection or cursor object
 
     technology_list : list of ``Technology`` objects
         All of the technologies initialized in the input file
     """
-    table_command = """CREATE TABLE "CostInvest" (
-                	"regions"	text,
-                	"tech"	text,
-                	"vintage"	integer,
-                	"cost_invest"	real,
-                	"cost_invest_units"	text,
-                	"cost_invest_notes"	text,
-                	PRIMARY KEY("regions","tech","vintage"),
-                	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods")
-                );
-                """
-
-    insert_command = """
-                     INSERT INTO "CostInvest" VALUES (?,?,?,?,?,?)
-                     """
+
+    insert_command = 'INSERT INTO "CostInvest" VALUES (?,?,?,?,?,?)'
+    periods = np.asarray(time_horizon, dtype=np.int64).tolist()
     entries = []
     for tech in technology_list:
         if len(tech.cost_invest) > 0:
@@ -899,27 +1317,25 @@ def create_invest_cost(connector, technology_list, time_horizon):
                 cost_invest = tech.cost_invest[place]
             except BaseException:
                 continue
+            tech_name = tech.tech_name
             if isinstance(cost_invest, dict):
                 data = [(place,
-                         tech.tech_name,
-                         int(year),
+                         tech_name,
+                         period,
                          cost_invest[year],
                          "",
-                         "") for year in time_horizon]
+                         "") for period, year in zip(periods, time_horizon)]
                 entries += data
-            elif (isinstance(cost_invest, float)) or (isinstance(cost_invest, int)):
+            elif isinstance(cost_invest, (float, int)):
                 data = [(place,
-                         tech.tech_name,
-                         int(year),
+                         tech_name,
+                         period,
                          cost_invest,
                          "",
-                         "") for year in time_horizon]
+                         "") for period in periods]
                 entries += data
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
 
     return
 
@@ -937,322 +1353,105 @@ def create_fixed_cost(connector, technology_list, time_horizon):
     cost in 2020 as a nuclear plant built in 2015 and 2020.
     Parameters
     ----------
-    connector : sqlite connector
+    connector : sqlite3 connection or cursor object
 
     technology_list : list of ``Technology`` objects
         All of the technologies initialized in the input file
     """
-    table_command = """CREATE TABLE "CostFixed" (
-                	"regions"	text NOT NULL,
-                	"periods"	integer NOT NULL,
-                	"tech"	text NOT NULL,
-                	"vintage"	integer NOT NULL,
-                	"cost_fixed"	real,
-                	"cost_fixed_units"	text,
-                	"cost_fixed_notes"	text,
-                	PRIMARY KEY("regions","periods","tech","vintage"),
-                	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
-                );"""
-
-    insert_command = """
-                     INSERT INTO "CostFixed" VALUES (?,?,?,?,?,?,?)
-                     """
+
+    insert_command = 'INSERT INTO "CostFixed" VALUES (?,?,?,?,?,?,?)'
+    rows = _vintage_cost_rows(technology_list, 'cost_fixed', time_horizon)
+    connector.executemany(insert_command, rows)
+
+    return
+
+
+def create_capacity_factor_tech(connector, technology_list, seasons, hours):
+    """
+    This function writes the ``CapacityFactorTech`` table in Temoa.
+    The capacity factor of a technology in a region may be a constant
+    or an array with one value per time slice.
+
+    Parameters
+    ----------
+    connector : sqlite3 connection or cursor object
+        Used to connect to and write to an sqlite database.
+    technology_list : list of ``Technology`` objects
+        All of the technologies initialized in the input file
+    seasons : list
+        The list of seasons in the simulation.
+    hours : list
+        The list of hours in the simulation.
+    """
+    time_slices = list(itertools.product(hours, seasons))
+    season_col = [ts[0] for ts in time_slices]
+    hour_col = [ts[1] for ts in time_slices]
     entries = []
     for tech in technology_list:
-        # check that cost exists
-        if len(tech.cost_fixed) > 0:
-            pass
-        else:
-            continue
+        entries += _capacity_factor_rows(tech, season_col, hour_col)
 
-        # loop through regions
-        for place in tech.regions:
-            # check if particular region has cost_data
-            try:
-                cost_fixed = tech.cost_fixed[place]
-            except BaseException:
-                continue
-            lifetime = float(tech.tech_lifetime[place])
-            # if there are existing vintages of the technology
-            try:
-                years = list(tech.existing_capacity[place].keys()) + \
-                    list(time_horizon)
-                years = [y for y in years if (time_horizon[0] - y) < lifetime]
-            except BaseException:
-                years = time_horizon
-            # generate future/vintage pairs
-            year_pairs = itertools.product(time_horizon, years)
-            if isinstance(cost_fixed, dict):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_fixed[year],
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-            elif (isinstance(cost_fixed, float)) or (isinstance(cost_fixed, int)):
-                db_entry = [(place,
-                             int(year),
-                             tech.tech_name,
-                             int(vintage),
-                             cost_fixed,
-                             "",
-                             "") for year, vintage in year_pairs
-                            if (year - vintage) < lifetime
-                            and (year - vintage) >= 0]
-                entries += db_entry
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    _insert_rows(connector, "CapacityFactorTech", entries, 6)
+    return
 
-    return table_command
 
+def _capacity_factor_rows(tech, season_col, hour_col):
+    """
+    Returns the ``CapacityFactorTech`` rows of one technology in every
+    region where its capacity factor is defined.
 
-def create_capacity_factor_tech(connector, technology_list, seasons, hours):
-    table_command = """
-        CREATE TABLE "CapacityFactorTech" (
-        	"regions"	text,
-        	"season_name"	text,
-        	"time_of_day_name"	text,
-        	"tech"	text,
-        	"cf_tech"	real CHECK("cf_tech" >= 0 AND "cf_tech" <= 1),
-        	"cf_tech_notes"	text,
-        	PRIMARY KEY("regions","season_name","time_of_day_name","tech"),
-        	FOREIGN KEY("season_name") REFERENCES "time_season"("t_season"),
-        	FOREIGN KEY("time_of_day_name") REFERENCES "time_of_day"("t_day"),
-        	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-        );
-        """
-
-    insert_command = """
-                     INSERT INTO "CapacityFactorTech" VALUES (?,?,?,?,?,?)
-                     """
-    cursor = connector.cursor()
-    cursor.execute(table_command)
+    Parameters
+    ----------
+    tech : ``Technology`` object
+        The technology.
+    season_col : list
+        The season of each time slice.
+    hour_col : list
+        The hour of each time slice.
+    """
+    tech_name = tech.tech_name
+    cft_dict = tech.capacity_factor_tech
+    entries = []
+    # loops over each region where the commodity is defined
+    for place in cft_dict:
+        data = np.asarray(cft_dict[place], dtype=np.float64)
+        if data.ndim == 0:
+            # for constant capacity factor, must be on the interval [0,1]
+            cf_col = itertools.repeat(float(data))
+        elif data.ndim == 1:
+            cf_col = data.tolist()
+        else:
+            cf_col = data.ravel().tolist()
+        entries += zip(itertools.repeat(place),
+                       season_col,
+                       hour_col,
+                       itertools.repeat(tech_name),
+                       cf_col,
+                       itertools.repeat(''))
+    return entries
 
+
+def _tech_flag_rows(technology_list, flag):
+    """
+    Returns a ``(tech, notes)`` row for every technology that has the
+    boolean attribute ``flag`` set, e.g. ``'reserve_tech'``.
+    """
+    return [(tech.tech_name, '')
+            for tech in technology_list
+            if getattr(tech, flag)]
+
+
+def _region_value_rows(technology_list, attr, *notes):
+    """
+    Returns a ``(region, tech, value, *notes)`` row for every region in
+    the per-region dictionary ``attr`` of each technology, e.g.
+    ``'ramp_up'``.
+    """
+    entries = []
     for tech in technology_list:
-        cft_dict = tech.capacity_factor_tech
-        # loops over each region where the commodity is defined
-        for place in cft_dict:
-            time_slices = itertools.product(hours, seasons)
-            data = cft_dict[place]
-            if (isinstance(data, list)) or (isinstance(data, np.ndarray)):
-                data = data.flatten()
-            elif (isinstance(data, int)) or (isinstance(data, float)):
-                # for constant capacity factor, must be on the interval [0,1]
-                data = np.ones(len(hours) * len(seasons)) * data
-            # print(tech.tech_name)
-            # breakpoint()
-            db_entry = [(place,
-                         ts[0][0],
-                         ts[1][0],
-                         tech.tech_name,
-                         float(d),
-                         '') for d,
-                        ts in zip(data, time_slices)]
-            # breakpoint()
-            cursor.executemany(insert_command, db_entry)
-
-    connector.commit()
-    return table_command
-
-
-def create_output_vcapacity(connector):
-    table_command = """CREATE TABLE "Output_V_Capacity" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"capacity"	real,
-                    	PRIMARY KEY("regions","scenario","tech","vintage"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_vflow_out(connector):
-    table_command = """CREATE TABLE "Output_VFlow_Out" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"t_periods"	integer,
-                    	"t_season"	text,
-                    	"t_day"	text,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_comm"	text,
-                    	"vflow_out"	real,
-                    	PRIMARY KEY("regions","scenario","t_periods","t_season","t_day","input_comm","tech","vintage","output_comm"),
-                    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("t_periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("t_season") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("t_day") REFERENCES "time_of_day"("t_day"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_vflow_in(connector):
-    table_command = """CREATE TABLE "Output_VFlow_In" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"t_periods"	integer,
-                    	"t_season"	text,
-                    	"t_day"	text,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_comm"	text,
-                    	"vflow_in"	real,
-                    	PRIMARY KEY("regions","scenario","t_periods","t_season","t_day","input_comm","tech","vintage","output_comm"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("t_periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("t_season") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("t_day") REFERENCES "time_of_day"("t_day"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_objective(connector):
-    table_command = """CREATE TABLE "Output_Objective" (
-                    	"scenario"	text,
-                    	"objective_name"	text,
-                    	"total_system_cost"	real
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_emissions(connector):
-    table_command = """CREATE TABLE "Output_Emissions" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"t_periods"	integer,
-                    	"emissions_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"emissions"	real,
-                    	PRIMARY KEY("regions","scenario","t_periods","emissions_comm","tech","vintage"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("emissions_comm") REFERENCES "EmissionActivity"("emis_comm"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("t_periods") REFERENCES "time_periods"("t_periods")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_curtailment(connector):
-    table_command = """CREATE TABLE "Output_Curtailment" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"t_periods"	integer,
-                    	"t_season"	text,
-                    	"t_day"	text,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_comm"	text,
-                    	"curtailment"	real,
-                    	PRIMARY KEY("regions","scenario","t_periods","t_season","t_day","input_comm","tech","vintage","output_comm"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("t_periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("t_season") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("t_day") REFERENCES "time_of_day"("t_day")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_costs(connector):
-    table_command = """CREATE TABLE "Output_Costs" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"output_name"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_cost"	real,
-                    	PRIMARY KEY("regions","scenario","output_name","tech","vintage"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_duals(connector):
-    table_command = """CREATE TABLE "Output_Duals" (
-                    	"constraint_name"	text,
-                    	"scenario"	text,
-                    	"dual"	real,
-                    	PRIMARY KEY("constraint_name","scenario")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
-
-
-def create_output_capacitybyperiodtech(connector):
-    table_command = """CREATE TABLE "Output_CapacityByPeriodAndTech" (
-                    	"regions"	text,
-                    	"scenario"	text,
-                    	"sector"	text,
-                    	"t_periods"	integer,
-                    	"tech"	text,
-                    	"capacity"	real,
-                    	PRIMARY KEY("regions","scenario","t_periods","tech"),
-                    	FOREIGN KEY("sector") REFERENCES "sector_labels"("sector"),
-                    	FOREIGN KEY("t_periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return table_command
+        tech_name = tech.tech_name
+        entries += [(place, tech_name, value) + notes
+                    for place, value in getattr(tech, attr).items()]
+    return entries
 
 
 def create_reserve_margin(connector, prm):
@@ -1262,52 +1461,20 @@ def create_reserve_margin(connector, prm):
 
     Parameters
     ----------
-    connector : sqlite connector
+    connector : sqlite3 connection or cursor object
     prm : dictionary
         A dictionary with regions as keys and reserve margins as values.
     """
-    table_command = """CREATE TABLE "PlanningReserveMargin" (
-                    	`regions`	text,
-                    	`reserve_margin`	REAL,
-                    	PRIMARY KEY(regions),
-                    	FOREIGN KEY(`regions`) REFERENCES regions
-                    );"""
-    insert_command = """
-                     INSERT INTO "PlanningReserveMargin" VALUES (?,?)
-                     """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
-    db_entry = [(place,
-                 margin
-                 ) for place, margin in zip(prm.keys(), prm.values())]
-
-    cursor.executemany(insert_command, db_entry)
-    connector.commit()
+    # dicts keep insertion order, so items() yields (region, margin) pairs
+    connector.executemany(_INSERT_PRM, prm.items())
     return
 
 
 def create_tech_reserve(connector, technology_list):
-    table_command = """CREATE TABLE "tech_reserve" (
-                    	"tech"	text,
-                    	"notes"	text,
-                    	PRIMARY KEY("tech")
-                    );"""
-    insert_command = """
-                     INSERT INTO "tech_reserve" VALUES (?,?)
-                     """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
-    db_entry = [(tech.tech_name, '')
-                for tech in technology_list
-                if tech.reserve_tech]
-
-    # breakpoint()
-    cursor.executemany(insert_command, db_entry)
-    connector.commit()
+    db_entry = _tech_flag_rows(technology_list, 'reserve_tech')
+
+    if db_entry:
+        connector.executemany(_INSERT_TECH_RESERVE, db_entry)
 
     return
 
@@ -1318,19 +1485,13 @@ def create_global_discount(connector, gdr):
 
     Parameters
     ----------
-    connector : sqlite connector
+    connector : sqlite3 connection or cursor object
     gdr : float
         The global discount rate to be applied.
     """
-    table_command = """CREATE TABLE "GlobalDiscountRate" (
-                    	"rate"	real
-                    );"""
     insert_command = """INSERT INTO "GlobalDiscountRate" VALUES (?)"""
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    cursor.execute(insert_command, [gdr])
-    connector.commit()
+    connector.execute(insert_command, [gdr])
     return
 
 
@@ -1341,74 +1502,22 @@ def create_tech_ramping(connector, technology_list):
     The ``ramping_tech`` parameter set to ``True`` should also
     have values set for ``RampUp`` and ``RampDown``
     """
-    table_command = """CREATE TABLE "tech_ramping" (
-                    	"tech"	text,
-                    	"notes"	text,
-                    	PRIMARY KEY("tech")
-                    );"""
-    insert_command = """
-                     INSERT INTO "tech_ramping" VALUES (?,?)
-                     """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
+    insert_command = 'INSERT INTO "tech_ramping" VALUES (?,?)'
 
     ramping_techs = [tech for tech in technology_list if tech.ramping_tech]
 
-    db_entry = [(tech.tech_name, '')
-                for tech in ramping_techs]
-
-    cursor.executemany(insert_command, db_entry)
-    connector.commit()
-
-    table_command = """CREATE TABLE RampUp(
-                    	"regions" text,
-                    	"tech" text,
-                    	"ramp_up" real,
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	PRIMARY KEY ("regions", "tech")
-                    );"""
-    insert_command = """
-                     INSERT INTO "RampUp" VALUES (?,?,?)
-                     """
-    cursor.execute(table_command)
+    db_entry = [(tech.tech_name, '') for tech in ramping_techs]
 
-    entries = []
-    for tech in ramping_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     up_rate)
-                    for place, up_rate in zip(list(tech.ramp_up.keys()),
-                                              list(tech.ramp_up.values()))]
-        entries += db_entry
+    connector.executemany(insert_command, db_entry)
 
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    insert_command = 'INSERT INTO "RampUp" VALUES (?,?,?)'
+    entries = _region_value_rows(ramping_techs, 'ramp_up')
+    connector.executemany(insert_command, entries)
 
     # RAMP DOWN
-    table_command = """CREATE TABLE RampDown(
-                     	"regions" text,
-                     	"tech" text,
-                     	"ramp_down" real,
-                     	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                     	PRIMARY KEY ("regions", "tech")
-                    );"""
-    insert_command = """
-                     INSERT INTO "RampDown" VALUES (?,?,?)
-                     """
-
-    cursor.execute(table_command)
-
-    entries = []
-    for tech in ramping_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     up_rate)
-                    for place, up_rate in zip(list(tech.ramp_down.keys()),
-                                              list(tech.ramp_down.values()))]
-        entries += db_entry
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    insert_command = 'INSERT INTO "RampDown" VALUES (?,?,?)'
+    entries = _region_value_rows(ramping_techs, 'ramp_down')
+    connector.executemany(insert_command, entries)
     return
 
 
@@ -1416,35 +1525,13 @@ def create_tech_storage(connector, technology_list):
     """
     This function writes the ``StorageDuration`` table.
     """
-    cursor = connector.cursor()
-
     storage_techs = [tech for tech in technology_list if tech.storage_tech]
 
-    table_command = """CREATE TABLE "StorageDuration" (
-                    	"regions"	text,
-                    	"tech"	text,
-                    	"duration"	real,
-                    	"duration_notes"	text,
-                    	PRIMARY KEY("regions","tech")
-                    );
-                    """
-    insert_command = """
-                     INSERT INTO "StorageDuration" VALUES (?,?,?,?)
-                     """
-    cursor.execute(table_command)
+    insert_command = 'INSERT INTO "StorageDuration" VALUES (?,?,?,?)'
 
-    entries = []
-    for tech in storage_techs:
-        db_entry = [(place,
-                     tech.tech_name,
-                     storage,
-                     '')
-                    for place, storage in zip(list(tech.storage_duration.keys()),
-                                              list(tech.storage_duration.values()))]
-        entries += db_entry
+    entries = _region_value_rows(storage_techs, 'storage_duration', '')
 
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
     return
 
 
@@ -1452,19 +1539,8 @@ def create_loan_lifetime(connector, technology_list):
     """
     This function writes the LifetimeLoanTech table in Temoa.
     """
-    table_command = """CREATE TABLE "LifetimeLoanTech" (
-                    	"regions"	text,
-                    	"tech"	text,
-                    	"loan"	real,
-                    	"loan_notes"	text,
-                    	PRIMARY KEY("regions","tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
     insert_command = """INSERT INTO "LifetimeLoanTech" VALUES(?,?,?,?)"""
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
     entries = []
     for tech in technology_list:
         db_entry = [(place,
@@ -1475,8 +1551,7 @@ def create_loan_lifetime(connector, technology_list):
                                            list(tech.loan_lifetime.values()))]
         entries += db_entry
 
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
     return
 
 
@@ -1484,18 +1559,7 @@ def create_capacity_to_activity(connector, technology_list):
     """
     This function writes the capacity to activity table in Temoa.
     """
-    table_command = """CREATE TABLE "CapacityToActivity" (
-                    	"regions"	text,
-                    	"tech"	text,
-                    	"c2a"	real,
-                    	"c2a_notes"	TEXT,
-                    	PRIMARY KEY("regions","tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
     insert_command = """INSERT INTO "CapacityToActivity" VALUES (?,?,?,?)"""
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
     entries = []
     for tech in technology_list:
         db_entry = [(place,
@@ -1505,8 +1569,7 @@ def create_capacity_to_activity(connector, technology_list):
                     for place in tech.regions]
         entries += db_entry
 
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
     return
 
 
@@ -1515,37 +1578,24 @@ def create_emissions_limit(connector, emissions_list):
     This function writes the emissions limit table in Temoa.
     """
 
-    table_command = """CREATE TABLE "EmissionLimit" (
-                    	"regions"	text,
-                    	"periods"	integer,
-                    	"emis_comm"	text,
-                    	"emis_limit"	real,
-                    	"emis_limit_units"	text,
-                    	"emis_limit_notes"	text,
-                    	PRIMARY KEY("periods","emis_comm"),
-                    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("emis_comm") REFERENCES "commodities"("comm_name")
-                    );"""
     insert_command = """INSERT INTO "EmissionLimit" VALUES (?,?,?,?,?,?)"""
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
     entries = []
     for emis in emissions_list:
+        emis_name = emis.comm_name
+        emis_units = emis.units
         for place in list(emis.emissions_limit.keys()):
             limit_data = emis.emissions_limit[place]
             db_entry = [(place,
                          year,
-                         emis.comm_name,
+                         emis_name,
                          limit,
-                         emis.units,
+                         emis_units,
                          '') for year, limit in zip(list(limit_data.keys()),
                                                     list(limit_data.values()))]
             entries += db_entry
 
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
 
     return
 
@@ -1555,71 +1605,49 @@ def create_emissions_activity(connector, technology_list, time_horizon):
     This function writes the emissions activity table in Temoa.
     """
 
-    table_command = """CREATE TABLE "EmissionActivity" (
-                    	"regions"	text,
-                    	"emis_comm"	text,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"vintage"	integer,
-                    	"output_comm"	text,
-                    	"emis_act"	real,
-                    	"emis_act_units"	text,
-                    	"emis_act_notes"	text,
-                    	PRIMARY KEY("regions","emis_comm","input_comm","tech","vintage","output_comm"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("vintage") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("output_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("emis_comm") REFERENCES "commodities"("comm_name")
-                    );"""
-    insert_command = """
-                     INSERT INTO "EmissionActivity" VALUES (?,?,?,?,?,?,?,?,?)
-                     """
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
+    insert_command = 'INSERT INTO "EmissionActivity" VALUES (?,?,?,?,?,?,?,?,?)'
     entries = []
     for tech in technology_list:
+        tech_name = tech.tech_name
         regions = list(tech.emissions.keys())
         for place in regions:
             emissions_list = list(tech.emissions[place].keys())
-            try:
-                years = list(tech.existing_capacity[place].keys()) + \
-                    list(time_horizon)
-                years = np.array(years)
-                # keep only those vintages that survive to the start of the
-                # simulation
-                years = years[(time_horizon[0] - years) <
-                              tech.tech_lifetime[place]]
-            except BaseException:
-                years = time_horizon
+            input_name = tech.input_comm[place].comm_name
+            output_comm = tech.output_comm[place]
+            output_name = output_comm.comm_name
+            # keep only those vintages that survive to the start of the
+            # simulation
+            years = _tech_vintages(tech, place, time_horizon).tolist()
             for emis in emissions_list:
+                emis_name = emis.comm_name
+                emis_units = f"{emis.units}/{output_comm.units}"
                 # check if dictionary
                 emis_data = tech.emissions[place][emis]
-                if (isinstance(emis_data, float)) or (isinstance(emis_data, int)):
+                if isinstance(emis_data, (float, int)):
                     db_entry = [(place,
-                                 emis.comm_name,
-                                 tech.input_comm[place].comm_name,
-                                 tech.tech_name,
-                                 int(vintage),
-                                 tech.output_comm[place].comm_name,
+                                 emis_name,
+                                 input_name,
+                                 tech_name,
+                                 vintage,
+                                 output_name,
                                  emis_data,
-                                 f"{emis.units}/{tech.output_comm[place].units}",
+                                 emis_units,
                                  '') for vintage in years]
                 elif isinstance(emis_data, dict):
-                    vintages = list(emis_data.keys())
+                    vintages = np.fromiter(emis_data, np.int64,
+                                           len(emis_data)).tolist()
                     db_entry = [(place,
-                                 emis.comm_name,
-                                 tech.input_comm[place].comm_name,
-                                 tech.tech_name,
-                                 int(vintage),
-                                 tech.output_comm[place].comm_name,
-                                 emis_data[vintage],
-                                 f"{emis.units}/{tech.output_comm[place].units}",
-                                 '') for vintage in vintages]
+                                 emis_name,
+                                 input_name,
+                                 tech_name,
+                                 vintage,
+                                 output_name,
+                                 emis_value,
+                                 emis_units,
+                                 '') for vintage, emis_value in zip(
+                                     vintages, emis_data.values())]
                 entries += db_entry
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
     return
 
 
@@ -1627,23 +1655,13 @@ def create_tech_curtailment(connector, technology_list):
     """
     This function writes the curtailment tech table.
     """
-    table_command = """CREATE TABLE "tech_curtailment" (
-                    	"tech"	text,
-                    	"notes"	TEXT,
-                    	PRIMARY KEY("tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
 
     insert_command = """INSERT INTO tech_curtailment VALUES (?,?)"""
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
-    entries = [(t.tech_name, '') for t in technology_list if t.curtailed_tech]
+    entries = _tech_flag_rows(technology_list, 'curtailed_tech')
 
-    cursor.executemany(insert_command, entries)
+    connector.executemany(insert_command, entries)
 
-    connector.commit()
     return
 
 
@@ -1651,21 +1669,8 @@ def create_max_capacity(connector, technology_list):
     """
     This function writes the MaxCapacity constraint in Temoa.
     """
-    table_command = """CREATE TABLE "MaxCapacity" (
-                    	"regions"	text,
-                    	"periods"	integer,
-                    	"tech"	text,
-                    	"maxcap"	real,
-                    	"maxcap_units"	text,
-                    	"maxcap_notes"	text,
-                    	PRIMARY KEY("regions","periods","tech"),
-                    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
     insert_command = """INSERT INTO MaxCapacity VALUES (?,?,?,?,?,?)"""
 
-    cursor=connector.cursor()
-
     entries = []
     for tech in technology_list:
 
@@ -1674,6 +1679,8 @@ def create_max_capacity(connector, technology_list):
             max_capacity = tech.max_capacity
         else:
             continue
+        tech_name = tech.tech_name
+        units = tech.units
 
         for place in list(max_capacity.keys()):
             periods = list(max_capacity[place].keys())
@@ -1681,16 +1688,14 @@ def create_max_capacity(connector, technology_list):
 
             db_entry = [(place,
                          period,
-                         tech.tech_name,
+                         tech_name,
                          cap,
-                         tech.units,
+                         units,
                          '') for period, cap in zip(periods, maxcap)]
 
             entries += db_entry
 
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
 
     return
 
@@ -1698,21 +1703,8 @@ def create_min_capacity(connector, technology_list):
     """
     This function writes the MinCapacity constraint in Temoa.
     """
-    table_command = """CREATE TABLE "MinCapacity" (
-                    	"regions"	text,
-                    	"periods"	integer,
-                    	"tech"	text,
-                    	"maxcap"	real,
-                    	"maxcap_units"	text,
-                    	"maxcap_notes"	text,
-                    	PRIMARY KEY("regions","periods","tech"),
-                    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
     insert_command = """INSERT INTO MinCapacity VALUES (?,?,?,?,?,?)"""
 
-    cursor=connector.cursor()
-
     entries = []
     for tech in technology_list:
 
@@ -1721,6 +1713,8 @@ def create_min_capacity(connector, technology_list):
             min_capacity = tech.min_capacity
         else:
             continue
+        tech_name = tech.tech_name
+        units = tech.units
 
         for place in list(min_capacity.keys()):
             periods = list(min_capacity[place].keys())
@@ -1728,16 +1722,14 @@ def create_min_capacity(connector, technology_list):
 
             db_entry = [(place,
                          period,
-                         tech.tech_name,
+                         tech_name,
                          cap,
-                         tech.units,
+                         units,
                          '') for period, cap in zip(periods, mincap)]
 
             entries += db_entry
 
-    cursor.execute(table_command)
-    cursor.executemany(insert_command, entries)
-    connector.commit()
+    connector.executemany(insert_command, entries)
 
     return
 
@@ -1746,62 +1738,22 @@ def create_tech_exchange(connector, technology_list):
     """
     This function creates the tech exchange table.
     """
-    table_command = """CREATE TABLE "tech_exchange" (
-                    	"tech"	text,
-                    	"notes"	TEXT,
-                    	PRIMARY KEY("tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech")
-                    );"""
 
     insert_command = """INSERT INTO tech_exchange VALUES (?,?)"""
 
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
-    entries = [(t.tech_name, '') for t in technology_list if t.exchange_tech]
+    entries = _tech_flag_rows(technology_list, 'exchange_tech')
 
-    cursor.executemany(insert_command, entries)
+    connector.executemany(insert_command, entries)
 
-    connector.commit()
     return
 
 
 
-def create_MyopicBaseYear(connector):
-    table_command = """CREATE TABLE "MyopicBaseyear" (
-                	"year"	real
-                	"notes"	text
-                    );
-                 """
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-    connector.commit()
-    return
-
-
 def create_tech_input_split(connector, region, tech, time_periods, comm_list, eff_list):
     """
     Creates the tech input split table
     """
 
-    table_command = """
-                    CREATE TABLE "TechInputSplit" (
-                    	"regions"	TEXT,
-                    	"periods"	integer,
-                    	"input_comm"	text,
-                    	"tech"	text,
-                    	"ti_split"	real,
-                    	"ti_split_notes"	text,
-                    	PRIMARY KEY("regions","periods","input_comm","tech"),
-                    	FOREIGN KEY("tech") REFERENCES "technologies"("tech"),
-                    	FOREIGN KEY("input_comm") REFERENCES "commodities"("comm_name"),
-                    	FOREIGN KEY("periods") REFERENCES "time_periods"("t_periods")
-                    );"""
-
-    cursor = connector.cursor()
-    cursor.execute(table_command)
-
     # I think this is the correct way to do an input split... not sure how
     # else to break it down.
     # ti_split = round(1/len(eff_list),3)
@@ -1820,9 +1772,8 @@ def create_tech_input_split(connector, region, tech, time_periods, comm_list, ef
         entries += entry
 
     insert_command = "INSERT INTO TechInputSplit VALUES (?,?,?,?,?,?)"
-    cursor.executemany(insert_command, entries)
+    connector.executemany(insert_command, entries)
 
-    connector.commit()
     return
 
 """